@@ -0,0 +1,70 @@
+"""
+One-time migration of the legacy location index file (a gzip pickled GeoDataFrame) to the plain array
+formats read by client_base._load_preprocessed_data without unpickling a DataFrame.
+
+    python scripts/convert_location_data.py                   # writes windwatts_data/data/location_data.npz
+    python scripts/convert_location_data.py --format parquet  # writes windwatts_data/data/location_data.parquet
+
+The npz file holds the arrays 'index' (fixed width strings), 'lat' and 'lon', written with
+np.savez_compressed so it loads with allow_pickle=False. The parquet file holds the columns 'index',
+'latitude' and 'longitude', compressed with zstd. The clients prefer the parquet file, then the npz file,
+and fall back to the gzip pickle, so only one of them needs to be shipped in windwatts_data/data.
+"""
+import argparse
+import gzip
+import os
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'windwatts_data', 'data')
+
+
+def read_location_arrays(path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read the legacy gzip pickle. The coordinates come from the geometry if present, as the clients build their
+    KDTree from it, else from the latitude and longitude columns.
+    :return: A tuple of (index, latitude, longitude) arrays.
+    """
+    with gzip.open(path, 'rb') as f:
+        location_gdf = pickle.load(f)
+    if 'geometry' in location_gdf:
+        latitudes = location_gdf.geometry.y.to_numpy(dtype=np.float64)
+        longitudes = location_gdf.geometry.x.to_numpy(dtype=np.float64)
+    else:
+        latitudes = location_gdf['latitude'].to_numpy(dtype=np.float64)
+        longitudes = location_gdf['longitude'].to_numpy(dtype=np.float64)
+    # Fixed width unicode instead of object, so np.load does not need pickle
+    index_array = np.asarray(location_gdf['index'].astype(str).to_numpy(), dtype=str)
+    return index_array, latitudes, longitudes
+
+
+def write_npz(path: str, index_array: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray):
+    np.savez_compressed(path, index=index_array, lat=latitudes, lon=longitudes)
+
+
+def write_parquet(path: str, index_array: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray):
+    table = pa.table({'index': pa.array(index_array, type=pa.string()), 'latitude': latitudes,
+                      'longitude': longitudes})
+    pq.write_table(table, path, compression='zstd')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert location_data.pkl.gz to the npz or parquet format.")
+    parser.add_argument('--input', default=os.path.join(_DATA_DIR, 'location_data.pkl.gz'),
+                        help="Legacy gzip pickle location file.")
+    parser.add_argument('--format', choices=('npz', 'parquet'), default='npz', help="Output format.")
+    parser.add_argument('--output', help="Output file. Defaults to location_data.<format> next to the input.")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(os.path.dirname(args.input), f"location_data.{args.format}")
+    index_array, latitudes, longitudes = read_location_arrays(args.input)
+    writer = write_npz if args.format == 'npz' else write_parquet
+    writer(output, index_array, latitudes, longitudes)
+    print(f"Wrote {len(index_array)} locations to {output}")
+
+
+if __name__ == '__main__':
+    main()
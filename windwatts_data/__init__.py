@@ -1,4 +1,5 @@
 from .wtk_client_1224 import WTKLedClient1224
 from .wtk_client_full_hourly import WTKLedClientFullHourly
 from .windwatts_wtk_client import WindwattsWTKClient
-from .client_base import client_base
\ No newline at end of file
+from .client_base import client_base
+from .lazy import LazyAthenaResult, LazyQuery, collect_all
\ No newline at end of file
@@ -3,14 +3,124 @@ from botocore.exceptions import BotoCoreError, ClientError
 import pandas as pd
 import numpy as np
 import time
-import gzip
+import io
 import pickle
 import os
+import re
 import json
+import logging
+import hashlib
+import threading
+import uuid
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from importlib.resources import files
-from io import BytesIO
+from collections import defaultdict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+import scipy
 from scipy.spatial import cKDTree
 
+logger = logging.getLogger(__name__)
+
+# ISA-L's vectorized DEFLATE decodes the gzip location file several times faster than zlib.
+try:
+    from isal import igzip as _gzip
+except ImportError:
+    import gzip as _gzip
+
+# Process-wide caches shared across client instances so that creating another
+# client does not repeat the DESCRIBE query or reload the location index file.
+# Column names are keyed by (database, table name), location data and KDTrees
+# by (file path, file mtime).
+_COLUMNS_CACHE: dict = {}
+_LOCATION_CACHE: dict = {}
+_KDTREE_CACHE: dict = {}
+
+# Height suffix of wtk columns (e.g. windspeed_100m) and era5 columns (e.g. ws100).
+_WTK_HEIGHT_PATTERN = re.compile(r'_(\d+)m$')
+_ERA5_HEIGHT_PATTERN = re.compile(r'^..(\d+)$')
+
+# Athena result files are downloaded as ranged GETs of this size, in parallel when larger than one range.
+_RANGE_SIZE = 8 * 1024 * 1024
+
+# Arrow types of the Athena/Glue column types, keyed by the type name without parameters.
+_ATHENA_ARROW_TYPES = {
+    'boolean': pa.bool_(),
+    'tinyint': pa.int8(),
+    'smallint': pa.int16(),
+    'int': pa.int32(),
+    'integer': pa.int32(),
+    'bigint': pa.int64(),
+    'float': pa.float32(),
+    'real': pa.float32(),
+    'double': pa.float64(),
+    'string': pa.string(),
+    'varchar': pa.string(),
+    'char': pa.string(),
+    'date': pa.date32(),
+    'timestamp': pa.timestamp('ms')
+}
+
+# Parts of a SELECT list item read by _select_output_names: a trailing alias outside parentheses, a plain
+# (optionally qualified or quoted) column reference, and a leading DISTINCT/ALL quantifier.
+_SELECT_ALIAS = re.compile(r'\bAS\s+"?(\w+)"?\s*$', re.IGNORECASE)
+_SELECT_COLUMN = re.compile(r'^(?:"?\w+"?\.)*"?\w+"?$')
+_SELECT_DISTINCT = re.compile(r'^\s*(?:(?:DISTINCT|ALL)\s+)?', re.IGNORECASE)
+
+# Number of nearest-location lookups remembered per client.
+_NEAREST_CACHE_SIZE = 4096
+
+# Number of height combinations whose relevant columns are remembered per client.
+_RELEVANT_COLUMNS_CACHE_SIZE = 256
+
+
+def _select_output_names(query_string: str) -> list[str]:
+    """
+    Output column names of the outermost SELECT list of a query, e.g. ['windspeed_100m', 'index'] for
+    "SELECT windspeed_100m, split_part(...) AS index FROM ...". Commas and keywords inside parentheses
+    or quotes are skipped, so CTEs and function arguments do not split the list. Unaliased expressions
+    get Athena's positional name, e.g. '_col1' for "CAST(year AS varchar)" in second place, and * is skipped.
+    """
+    depth, quote, start, items = 0, None, None, []
+    upper = query_string.upper()
+    i = 0
+    while i < len(query_string):
+        char = query_string[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0:
+            if start is None and re.match(r'SELECT\b', upper[i:]) and (i == 0 or not upper[i - 1].isalnum()):
+                i += len('SELECT')
+                start = i
+                continue
+            if start is not None and char == ',':
+                items.append(query_string[start:i])
+                start = i + 1
+            elif start is not None and re.match(r'\sFROM\b', upper[i:]):
+                items.append(query_string[start:i])
+                break
+        i += 1
+    names = []
+    for position, item in enumerate(items):
+        item = _SELECT_DISTINCT.sub('', item) if position == 0 else item.strip()
+        alias = _SELECT_ALIAS.search(item)
+        if alias:
+            names.append(alias.group(1))
+        elif _SELECT_COLUMN.match(item):
+            names.append(item.split('.')[-1].strip('"'))
+        elif not item.endswith('*'):
+            names.append(f"_col{position}")
+    return names
+
 class client_base:
     
     def __init__(self, config_path=None, data :str = None):
@@ -40,12 +150,19 @@ class client_base:
         self.s3 = boto3.client('s3', region_name=self.config.get('region_name'))
         self.bucket_name = self.config.get('bucket_name')
         self.athena = boto3.client('athena', region_name=self.config.get('region_name'))
+        self.glue = boto3.client('glue', region_name=self.config.get('region_name'))
         self.database = self.config.get('database')
         self.output_location = self.config.get('output_location')
         self.output_bucket = self.config.get('output_bucket')
         
-        # Path for location index file for wtk 1224 data
+        # Path for location index file for wtk 1224 data.
+        # Prefer the zstd compressed parquet file, then the npz of plain arrays and fall back to the legacy gzip pickle.
         self.wtk_preprocessed_file_path = str(files('windwatts_data').joinpath('data/location_data.pkl.gz'))
+        for file_name in ('data/location_data.parquet', 'data/location_data.npz'):
+            file_path = str(files('windwatts_data').joinpath(file_name))
+            if os.path.exists(file_path):
+                self.wtk_preprocessed_file_path = file_path
+                break
 
         # Load athena table with respect to the data source
         if self.data == 'era5':
@@ -56,13 +173,48 @@ class client_base:
         self.alt_athena_table_name = self.config.get('alt_athena_table_name')
         self.athena_table_name = self.default_athena_table_name
         self.athena_workgroup=self.config.get('athena_workgroup')
-        self.location_gdf = None
+        # Maximum age of reusable Athena results for location timeseries queries.
+        self.result_reuse_minutes = self.config.get('result_reuse_minutes', 60)
+        # On-disk LRU cache for location timeseries. Set cache_dir to null in the config to disable it.
+        self.cache_dir = self.config.get('cache_dir', os.path.join(os.path.expanduser('~'), '.cache', 'windwatts'))
+        self.cache_max_bytes = self.config.get('cache_max_bytes', 1024 ** 3)
+        # Backend of DataFrames returned by query_athena, 'numpy' (default) or 'pyarrow' for Arrow-backed columns.
+        self.dtype_backend = self.config.get('dtype_backend', 'numpy')
+        # Run filtered queries as Athena prepared statements with the filter values bound as parameters.
+        self.prepared_statements = self.config.get('prepared_statements', False)
+        self._prepared = {}
+        self._prepare_lock = threading.Lock()
+        # Maximum number of Athena queries a single call runs concurrently, e.g. one per nearest location.
+        self.max_concurrency = self.config.get('max_concurrency', 8)
+        # UNLOAD SELECT results as Parquet under unload_location and read them with pyarrow instead of the CSV result.
+        self.unload_results = self.config.get('unload_results', False)
+        self.unload_location = self.config.get(
+            'unload_location', f"{(self.output_location or '').rstrip('/')}/windwatts_unload")
+        self._location_gdf = None
+        self._location_cache_key = None
+        self._coords = None
+        self._index_array = None
+        self._index_lookup = None
+        self._latitudes = None
+        self._longitudes = None
         self.kdtree = None
+        self._nearest_cache = {}
         self.column_mapping=None
-        self.column_names = self._initialize_column_names()
-        self._load_preprocessed_data()
+        self._sorted_heights = None
+        self._relevant_columns_cache = {}
+        self._has_index_partition_col = {}
+        self._partition_values_cache = {}
+        self.column_types = {}
+        self._column_schemas = {}
+        # The column lookup is a network round-trip and independent of the location data,
+        # so it runs while the location index is loaded and the KDTree is built.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            column_names_future = executor.submit(self._initialize_column_names)
+            self._load_preprocessed_data()
+            self.build_kdtree()
+            self.column_names = column_names_future.result()
+        self._refresh_column_views()
         self._initialize_column_mapping()
-        self.build_kdtree()
         
     
     def _load_config(self, config_path):
@@ -72,58 +224,287 @@ class client_base:
     
     def _initialize_column_names(self):
         """
-        Run the DESCRIBE query once during initialization to get column names.
+        Fetch the column names once during initialization from the Glue Data Catalog.
+        Falls back to a DESCRIBE query through Athena if the Glue lookup fails.
+        Results are cached per (database, table) for the lifetime of the process.
+        The column types are kept in self.column_types.
         :return: A list of column names.
         """
-        query = f"DESCRIBE {self.athena_table_name}"
-        raw_results = self.query_athena(query, convert_to_dataframe=False)
+        columns = self._table_columns(self.athena_table_name)
+        self.column_types = dict(columns)
+        # Return a new list since _reset_index_ mutates the instance list.
+        return [name for name, _ in columns]
+
+    def _table_columns(self, table_name):
+        """
+        Columns of `table_name` from the Glue Data Catalog, or from a DESCRIBE query if the Glue lookup fails.
+        Cached per (database, table) for the lifetime of the process.
+        :return: A list of (column name, column type) tuples.
+        """
+        cache_key = (self.database, table_name)
+        if cache_key not in _COLUMNS_CACHE:
+            try:
+                columns = self._get_glue_columns(table_name)
+            except (BotoCoreError, ClientError):
+                columns = self._describe_columns(table_name)
+
+            # Find the stopping point dynamically
+            column_names = [name for name, _ in columns]
+            if 'index' in column_names:
+                columns = columns[:column_names.index('index') + 1]  # Keep only valid columns
+            _COLUMNS_CACHE[cache_key] = columns
+        return _COLUMNS_CACHE[cache_key]
+
+    def _get_glue_columns(self, table_name=None):
+        """
+        Read the columns of the current table, or of `table_name`, from the Glue Data Catalog.
+        This is a single metadata call and does not run or bill an Athena query.
+        Partition keys are listed after the regular columns, matching DESCRIBE output.
+        :return: A list of (column name, column type) tuples.
+        """
+        database, _, table_name = (table_name or self.athena_table_name).rpartition('.')
+        response = self.glue.get_table(DatabaseName=database or self.database, Name=table_name)
+        table = response['Table']
+        columns = table['StorageDescriptor']['Columns'] + table.get('PartitionKeys', [])
+        return [(col['Name'], col.get('Type', '')) for col in columns]
+
+    def _describe_columns(self, table_name=None):
+        """
+        Run the DESCRIBE query through Athena to get the columns of the current table, or of `table_name`.
+        :return: A list of (column name, column type) tuples.
+        """
+        query = f"DESCRIBE {table_name or self.athena_table_name}"
+        raw_results = self.query_athena(query, convert_to_dataframe=False, result_reuse_minutes=10080)
 
-        # Extract column names from the raw results
+        # Extract column names and types from the raw results
         data = raw_results['data']
-        column_names = [row[0].split('\t')[0].strip() for row in data if row]
-        # Find the stopping point dynamically
-        try:
-            last_valid_index = column_names.index('index') + 1
-            column_names = column_names[:last_valid_index]  # Keep only valid columns
-        except ValueError:
-            pass
-        return column_names
-    
+        columns = []
+        for row in data:
+            if row:
+                fields = row[0].split('\t')
+                columns.append((fields[0].strip(), fields[1].strip() if len(fields) > 1 else ''))
+        return columns
+
+    def _partition_values(self, table_name, column):
+        """
+        Values of the `column` partition of `table_name`, if the table lists them with enum partition projection
+        (projection.<column>.values) in the Glue Data Catalog. Looked up once and cached per table and column.
+        :return: A frozenset of values, or None if they are not known.
+        """
+        cache_key = (table_name, column)
+        if cache_key not in self._partition_values_cache:
+            values = None
+            try:
+                database, _, name = table_name.rpartition('.')
+                parameters = self.glue.get_table(DatabaseName=database or self.database, Name=name)['Table'].get('Parameters', {})
+                if (parameters.get('projection.enabled', '').lower() == 'true'
+                        and parameters.get(f'projection.{column}.type') == 'enum'):
+                    values = frozenset(value.strip() for value in parameters[f'projection.{column}.values'].split(','))
+            except (BotoCoreError, ClientError, KeyError):
+                pass
+            self._partition_values_cache[cache_key] = values
+        return self._partition_values_cache[cache_key]
+
+    def _index_select_expression(self, table_name):
+        """
+        SELECT list expression for the location index of `table_name`. Tables with an `index` column or
+        partition key select it directly. Otherwise the index is cut out of the object path with two
+        split_part calls, which are plain byte scans unlike a per-row regular expression.
+        Whether a table has the column is looked up once in the Glue Data Catalog and cached per table.
+        """
+        if table_name not in self._has_index_partition_col:
+            try:
+                column_names = {name for name, _ in self._get_glue_columns(table_name)}
+            except (BotoCoreError, ClientError):
+                column_names = set()
+            self._has_index_partition_col[table_name] = 'index' in column_names
+        if self._has_index_partition_col[table_name]:
+            return "index"
+        return "split_part(split_part(\"$path\", '/index=', 2), '/', 1) AS index"
+
+    @property
+    def column_schema(self):
+        """
+        Read-only mapping of every column of the current table to its pyarrow DataType, built once per table
+        from the catalog types in self.column_types. Gives constant time existence and type lookups; unknown
+        types map to string.
+        """
+        schema = self._column_schemas.get(self.athena_table_name)
+        if schema is None:
+            schema = {}
+            for name, column_type in self.column_types.items():
+                base_type = column_type.split('(')[0].strip().lower()
+                schema[name] = _ATHENA_ARROW_TYPES.get(base_type, pa.string())
+            schema = self._column_schemas[self.athena_table_name] = MappingProxyType(schema)
+        return schema
+
+    def _sql_values(self, column, values):
+        """
+        Format values for an IN list on `column`. Numbers are emitted as bare literals so Athena can compare
+        them natively and prune by partition or Parquet statistics. Values are only quoted when the column
+        is a string type, such as a string partitioned year, or when its type is unknown.
+        :return: A comma separated string of SQL literals.
+        """
+        column_type = self.column_schema.get(column, pa.string())
+        if pa.types.is_integer(column_type) or pa.types.is_floating(column_type):
+            return ', '.join(map(str, values))
+        return ', '.join(f"'{value}'" for value in values)
+
     def _initialize_column_mapping(self):
         """
         Preprocess the all_columns list into a dictionary grouped by height.
         """
-        column_mapping = {}
+        pattern = _WTK_HEIGHT_PATTERN if self.data == 'wtk' else _ERA5_HEIGHT_PATTERN
+        column_mapping = defaultdict(list)
         for col in self.column_names:
-                try:
-                    if col.endswith('m') and self.data == 'wtk':
-                        height = int(col.split('_')[-1][:-1])  # Extract numeric height for wtk data
-                    else:
-                        height = int(col[2:]) # Extract numeric height for era5 data
-                    if height not in column_mapping:
-                        column_mapping[height] = []
-                    column_mapping[height].append(col)
-                except ValueError:
-                    continue  # Skip invalid heights
-        self.column_mapping = column_mapping
+            match = pattern.search(col)
+            if match:
+                column_mapping[int(match.group(1))].append(col)
+        self.column_mapping = dict(column_mapping)
+        self._sorted_heights = np.array(sorted(self.column_mapping.keys()), dtype=np.int32)
+        self._relevant_columns_cache = {}
         
     
+    @property
+    def location_gdf(self):
+        """
+        Location index data as a DataFrame. Parquet and npz location files are loaded into plain
+        arrays, so the DataFrame is only assembled the first time it is accessed.
+        """
+        if self._location_gdf is None and self._index_array is not None:
+            self._location_gdf = pd.DataFrame({
+                'index': self._index_array,
+                'latitude': self._latitudes,
+                'longitude': self._longitudes
+            })
+        return self._location_gdf
+
+    @location_gdf.setter
+    def location_gdf(self, value):
+        self._location_gdf = value
+
     def _load_preprocessed_data(self):
         """
         Load the location index data with respect to the data source from package.
+        The loaded data is shared across instances until the file changes on disk.
         """
-        if self.location_gdf is None:
+        if self._index_array is None:
             if self.data == 'wtk':
-                with gzip.open(self.wtk_preprocessed_file_path, 'rb') as f:
-                    self.location_gdf = pickle.load(f)
+                cache_key = (self.wtk_preprocessed_file_path, os.path.getmtime(self.wtk_preprocessed_file_path))
+                if cache_key not in _LOCATION_CACHE:
+                    _LOCATION_CACHE[cache_key] = self._read_location_file(self.wtk_preprocessed_file_path)
+                self._location_cache_key = cache_key
+                (self._location_gdf, self._coords, self._index_array, self._index_lookup,
+                 self._latitudes, self._longitudes) = _LOCATION_CACHE[cache_key]
             else:
-                raise Exception("Location index file for {self.data} is not yet available in this package.")
+                raise Exception(f"Location index file for {self.data} is not yet available in this package.")
+
+    def _read_location_file(self, path):
+        """
+        Read a location index file into plain arrays.
+        Parquet and npz files (written with np.savez_compressed(path, index=..., lat=..., lon=...)) skip
+        building a DataFrame. The legacy gzip pickle holds a GeoDataFrame, which is kept as is.
+        :return: A tuple of (location DataFrame or None, float32 (longitude, latitude) array, index array,
+                 index lookup, latitude array, longitude array).
+        """
+        location_gdf = None
+        if path.endswith('.parquet'):
+            table = pq.read_table(path, columns=['index', 'latitude', 'longitude'])
+            index_array = table.column('index').to_numpy()
+            latitudes = table.column('latitude').to_numpy()
+            longitudes = table.column('longitude').to_numpy()
+        elif path.endswith('.npz'):
+            with np.load(path, allow_pickle=False) as arrays:
+                index_array = arrays['index']
+                latitudes = arrays['lat']
+                longitudes = arrays['lon']
+        else:
+            with io.BufferedReader(_gzip.open(path, 'rb'), buffer_size=128 * 1024) as f:
+                location_gdf = pickle.load(f)
+            index_array = location_gdf['index'].to_numpy()
+            latitudes = location_gdf['latitude'].to_numpy()
+            longitudes = location_gdf['longitude'].to_numpy()
+
+        if location_gdf is not None and 'geometry' in location_gdf:
+            coords = self._extract_coordinates(location_gdf)
+        else:
+            coords = np.ascontiguousarray(np.column_stack([longitudes, latitudes]), dtype=np.float32)
+        return location_gdf, coords, index_array, pd.Index(index_array), latitudes, longitudes
+
+    @staticmethod
+    def _extract_coordinates(location_gdf):
+        """
+        Extract (longitude, latitude) pairs as a contiguous float32 array of shape (N, 2).
+        """
+        if 'geometry' in location_gdf:
+            coords = np.column_stack([location_gdf.geometry.x.to_numpy(), location_gdf.geometry.y.to_numpy()])
+        else:
+            # The parquet location file carries plain coordinates without geometry.
+            coords = location_gdf[['longitude', 'latitude']].to_numpy()
+        return np.ascontiguousarray(coords, dtype=np.float32)
 
     def build_kdtree(self):
         """Precompute KDTree for fast nearest neighbor search."""
         if self.kdtree is None:
-            coords = np.vstack((self.location_gdf.geometry.x, self.location_gdf.geometry.y)).T
-            self.kdtree = cKDTree(coords)
+            cache_key = self._location_cache_key
+            if cache_key not in _KDTREE_CACHE:
+                _KDTREE_CACHE[cache_key] = self._load_or_build_kdtree(cache_key)
+            self.kdtree = _KDTREE_CACHE[cache_key]
+
+    def _load_or_build_kdtree(self, cache_key):
+        """
+        Load the KDTree for the location data from the on-disk cache, or build it and persist it
+        so later processes skip construction. The tree is built unbalanced and without compacted
+        nodes since it is built once and only queried afterwards.
+        Unpickling runs code, so a cached tree is only loaded if it and the cache directory belong to the
+        current user and are not writable by others. Any failure to load falls back to building the tree.
+        """
+        tree_path = None
+        if self.cache_dir:
+            key = hashlib.sha1(f"{cache_key}:{scipy.__version__}".encode()).hexdigest()
+            tree_path = os.path.join(self.cache_dir, f"kdtree_{key}.pkl")
+            if self._is_private_path(self.cache_dir) and self._is_private_path(tree_path):
+                try:
+                    with open(tree_path, 'rb') as f:
+                        kdtree = pickle.load(f)
+                    if isinstance(kdtree, cKDTree):
+                        return kdtree
+                except Exception:
+                    # A stale or corrupt file, e.g. written by another scipy or Python version
+                    pass
+
+        kdtree = cKDTree(self._coords, leafsize=32, balanced_tree=False, compact_nodes=False)
+
+        if tree_path:
+            tmp_path = f"{tree_path}.{os.getpid()}.tmp"
+            try:
+                self._make_cache_dir(self.cache_dir)
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(kdtree, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, tree_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return kdtree
+
+    @staticmethod
+    def _make_cache_dir(path):
+        """Create a cache directory, and its missing parents, readable and writable by the current user only."""
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def _is_private_path(path):
+        """
+        Whether `path` exists, is owned by the current user and is not writable by group or others.
+        Always True where file ownership is not available (Windows).
+        """
+        if not hasattr(os, 'getuid'):
+            return os.path.exists(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
         
     def find_nearest_location(self, user_lat, user_long):
         """
@@ -132,15 +513,19 @@ class client_base:
         :param user_long: User's longitude
         :return: The indexes of the n nearest locations.
         """
-        if self.location_gdf is None:
+        if self._index_array is None:
             self._load_preprocessed_data()
         
         if self.kdtree is None:
             self.build_kdtree()
         
-        _, nearest_idx = self.kdtree.query([user_long, user_lat])
+        # n=None marks the single index, find_n_nearest_locations(n=1) caches a one-element tuple under n=1
+        cache_key = (self._location_cache_key, round(user_lat, 6), round(user_long, 6), None)
+        if cache_key not in self._nearest_cache:
+            _, nearest_idx = self.kdtree.query([user_long, user_lat], workers=1)
+            self._remember_nearest(cache_key, self._index_array[nearest_idx])
         
-        return self.location_gdf.iloc[nearest_idx]['index']
+        return self._nearest_cache[cache_key]
     
     def find_n_nearest_locations(self, user_lat, user_long, n):
         """
@@ -150,29 +535,182 @@ class client_base:
         :param n: Number of nearest locations/indexes to find.
         :return: The indexes of the n nearest locations.
         """
-        if self.location_gdf is None:
+        if self._index_array is None:
             self._load_preprocessed_data()
 
         if self.kdtree is None:
             self.build_kdtree()
         
-        # Query KDTree for the N nearest neighbors
-        _, nearest_idxs = self.kdtree.query([user_long, user_lat], k=n)  # k=N for multiple nearest
+        cache_key = (self._location_cache_key, round(user_lat, 6), round(user_long, 6), n)
+        if cache_key not in self._nearest_cache:
+            # Query KDTree for the N nearest neighbors
+            _, nearest_idxs = self.kdtree.query([user_long, user_lat], k=n, workers=1)  # k=N for multiple nearest
+            # k=1 returns a scalar position, which would index a single string
+            self._remember_nearest(cache_key, tuple(self._index_array[np.atleast_1d(nearest_idxs)].tolist()))
+
+        return list(self._nearest_cache[cache_key])
+
+    def _remember_nearest(self, cache_key, value):
+        """
+        Store a nearest-location result, keyed by coordinates rounded to 6 decimals (well below the grid spacing).
+        The oldest entry is dropped once the cache holds _NEAREST_CACHE_SIZE results.
+        """
+        if len(self._nearest_cache) >= _NEAREST_CACHE_SIZE:
+            self._nearest_cache.pop(next(iter(self._nearest_cache)))
+        self._nearest_cache[cache_key] = value
+
+    def find_nearest_locations_batch(self, user_lats, user_longs, n=1):
+        """
+        Find the n nearest locations for many points in a single vectorized KDTree query.
+        The query runs on all available cores.
+        :param user_lats: Sequence of latitudes.
+        :param user_longs: Sequence of longitudes, same length as user_lats.
+        :param n: Number of nearest locations/indexes to find per point. Default is 1.
+        :return: A NumPy array of indexes with shape (M,) for n=1 or (M, n) otherwise.
+        """
+        if self._index_array is None:
+            self._load_preprocessed_data()
+
+        if self.kdtree is None:
+            self.build_kdtree()
 
-        return self.location_gdf.iloc[nearest_idxs]['index'].tolist()
+        user_lats = np.asarray(user_lats, dtype=np.float32)
+        user_longs = np.asarray(user_longs, dtype=np.float32)
+        if user_lats.shape != user_longs.shape:
+            raise ValueError("user_lats and user_longs must have the same length.")
+
+        points = np.column_stack([user_longs.ravel(), user_lats.ravel()])
+        _, nearest_idxs = self.kdtree.query(points, k=n, workers=-1)
+
+        return self._index_array[nearest_idxs]
     
 
-    def query_athena(self, query_string, convert_to_dataframe=True, return_result_location_only=False, reduce_poll=False) -> pd.DataFrame:
+    @staticmethod
+    def _all_int(values, low=None, high=None) -> bool:
+        """
+        Check that every value is an int (bools excluded), optionally within [low, high].
+        Compares the set of element types and the min/max once instead of per-element isinstance and range checks.
+        :return: True if all values are valid. An empty sequence is valid.
+        """
+        if not set(map(type, values)) <= {int}:
+            return False
+        if values and low is not None and min(values) < low:
+            return False
+        if values and high is not None and max(values) > high:
+            return False
+        return True
+
+    @staticmethod
+    def _index_filter(indexes) -> str:
+        """
+        Build a canonical `index IN (...)` predicate for one or more location indexes.
+        Indexes are deduplicated and sorted so the same set of locations always produces
+        byte-identical SQL, which lets Athena reuse earlier query results.
+        :param indexes: A single index or a list of indexes.
+        :return: The SQL predicate string.
+        """
+        if isinstance(indexes, str):
+            indexes = [indexes]
+        index_list = ', '.join("'" + str(idx).replace("'", "''") + "'" for idx in sorted(set(indexes)))
+        return f"index IN ({index_list})"
+
+    @staticmethod
+    def _bind(literal: str, params: list[str] = None) -> str:
+        """
+        Return the SQL `literal` as is, or append it to `params` and return a ? placeholder when collecting the
+        parameters of a prepared statement.
+        """
+        if params is None:
+            return literal
+        params.append(literal)
+        return '?'
+
+    def query_athena_prepared(self, query_string: str, params: list[str], **kwargs) -> pd.DataFrame:
+        """
+        Execute a query with ? placeholders as an Athena prepared statement. The statement is prepared once per
+        distinct query shape, named after a hash of it, and later calls only EXECUTE it with new parameters.
+
+        :param query_string: The SQL query with ? placeholders.
+        :param params: SQL literals bound to the placeholders, in order (strings quoted).
+        :param kwargs: Passed on to query_athena.
+        :return: The result of query_athena for the EXECUTE statement.
+        """
+        # Concurrent queries of the same shape prepare it only once
+        with self._prepare_lock:
+            statement_name = self._prepared.get(query_string)
+            if statement_name is None:
+                statement_name = f"windwatts_{hashlib.blake2b(query_string.encode()).hexdigest()[:16]}"
+                try:
+                    self.query_athena(f"PREPARE {statement_name} FROM {query_string}",
+                                      return_result_location_only=True, result_reuse_minutes=0)
+                except Exception as e:
+                    raise RuntimeError("Failed to prepare the query statement.") from e
+                self._prepared[query_string] = statement_name
+        execute = f"EXECUTE {statement_name}"
+        if params:
+            execute += f" USING {', '.join(params)}"
+        return self.query_athena(execute, **kwargs)
+
+    def _open_result_object(self, bucket, key):
+        """
+        Open an Athena result object on S3 for reading. The first 8 MB range is requested directly, without a
+        HEAD request for the size, so small results take a single round-trip. Its Content-Range gives the
+        object size, and the remaining 8 MB ranges of larger objects are fetched in parallel into one
+        preallocated buffer, since a single stream is bandwidth-bound well below what S3 delivers over
+        several connections.
+        :return: A pyarrow.BufferReader over the object.
+        """
+        try:
+            response = self.s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{_RANGE_SIZE - 1}")
+        except ClientError as e:
+            # S3 rejects any range of an empty object
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                return pa.BufferReader(b'')
+            raise
+        first = response['Body'].read()
+        content_range = response.get('ContentRange')
+        size = int(content_range.rsplit('/', 1)[1]) if content_range else len(first)
+        if size <= len(first):
+            return pa.BufferReader(first)
+
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        view[:len(first)] = first
+
+        def fetch_range(start):
+            end = min(start + _RANGE_SIZE, size) - 1
+            body = self.s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")['Body']
+            offset = start
+            while chunk := body.read(1024 * 1024):
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(fetch_range, range(len(first), size, _RANGE_SIZE)))
+        return pa.BufferReader(pa.py_buffer(buffer))
+
+    def query_athena(self, query_string, convert_to_dataframe=True, return_result_location_only=False, return_result_uri: bool = False, reduce_poll=False, result_reuse_minutes: int = 10080, downcast: bool = False, dtype_backend: str = None, columns: list[str] = None) -> pd.DataFrame:
         """
         Executes an Athena query and fetches results as a Pandas DataFrame or raw data.
 
         :param query_string: The SQL query to execute.
         :param convert_to_dataframe: If True, converts results into a Pandas DataFrame.
         :param return_result_location_only: If True, returns the S3 result location only.
-        :param reduce_poll: If True, reduces query status poll time to 0.1 Sec else default is 0.5 Sec.
+        :param return_result_uri: If True, returns the S3 URI of the result object (CSV) without reading it.
+        :param reduce_poll: If True, reduces the initial query status poll interval to 0.1 Sec else default is 0.5 Sec.
+        :param result_reuse_minutes: Maximum age in minutes of a previous identical query's results that Athena may reuse
+                                     instead of running the query again. Default is 10080 (one week). 0 disables reuse.
+        :param downcast: If True, float64 columns are returned as float32 and year/mohr as int16 to halve memory traffic.
+        :param dtype_backend: 'pyarrow' returns Arrow-backed pandas columns (zero-copy from the parsed result) and
+                              'numpy' NumPy-backed ones. Defaults to the `dtype_backend` config value, else 'numpy'.
+        :param columns: Result columns to convert into the DataFrame. If None, all columns are converted.
         :return: Pandas DataFrame (if convert_to_dataframe=True) or raw results (if False).
         :raises RuntimeError: If the Athena query fails or encounters an AWS error.
         """
+        if (self.unload_results and convert_to_dataframe and not return_result_location_only and not return_result_uri
+                and self._can_unload(query_string)):
+            return self._query_athena_unload(query_string, reduce_poll=reduce_poll, downcast=downcast,
+                                             dtype_backend=dtype_backend, columns=columns)
 
         try:
             # Start query execution
@@ -181,30 +719,38 @@ class client_base:
                 QueryExecutionContext={'Database': self.database},
                 ResultConfiguration={'OutputLocation': self.output_location},
                 ResultReuseConfiguration={
-                    'ResultReuseByAgeConfiguration': {'Enabled': True, 'MaxAgeInMinutes': 10080}
+                    'ResultReuseByAgeConfiguration': {
+                        'Enabled': result_reuse_minutes > 0,
+                        'MaxAgeInMinutes': max(result_reuse_minutes, 1)
+                    }
                 },
                 WorkGroup = self.athena_workgroup
             )
             query_execution_id = response['QueryExecutionId']
 
-            # Poll query status with exponential backoff
+            # Poll query status with exponential backoff.
+            # Queries practically never finish before the first status check, so wait briefly
+            # before polling and grow the interval gently, capped at 2 seconds to bound tail latency.
             status = 'RUNNING'
             if not reduce_poll:
                 wait_time = 0.5
             else:
                 wait_time = 0.1
+            time.sleep(0.15)
             while status in ['RUNNING', 'QUEUED']:
                 response = self.athena.get_query_execution(QueryExecutionId=query_execution_id)
                 status = response['QueryExecution']['Status']['State']
                 if status in ['RUNNING', 'QUEUED']:
                     time.sleep(wait_time)
-                    wait_time = min(wait_time * 2, 5)  # Cap the backoff at 5 seconds
+                    wait_time = min(wait_time * 1.5, 2.0)
 
             # Handle query completion or failure
             if status == 'SUCCEEDED':
                 result_location = response['QueryExecution']['ResultConfiguration']['OutputLocation']
 
                 # Return S3 location only
+                if return_result_uri:
+                    return result_location
                 if return_result_location_only:
                     return f"File is too large to return at runtime. Download the result from {result_location}."
 
@@ -225,13 +771,16 @@ class client_base:
                     ]
                     return {'columns': columns, 'data': data}
 
-                # Fetch and process results into a DataFrame
+                # Fetch and process results into a DataFrame.
+                # Arrow parses the downloaded object directly with its multithreaded CSV reader.
                 bucket, key = result_location.replace("s3://", "").split("/", 1)
-                csv_obj = self.s3.get_object(Bucket=bucket, Key=key)
-                df_chunks = pd.read_csv(BytesIO(csv_obj['Body'].read()), dtype={'index': str}, chunksize=100000)
-                df = pd.concat(df_chunks, ignore_index=True)
+                table = pacsv.read_csv(
+                    self._open_result_object(bucket, key),
+                    convert_options=pacsv.ConvertOptions(column_types={'index': pa.string()}, strings_can_be_null=True,
+                                                         include_columns=columns or [])
+                )
                 #df = self._convert_dataframe_types(df)
-                return df
+                return self._table_to_dataframe(table, downcast, dtype_backend)
 
             elif status == 'FAILED':
                 error_message = response['QueryExecution']['Status']['StateChangeReason']
@@ -250,16 +799,180 @@ class client_base:
             raise RuntimeError(f"Unexpected error: {e}")
 
 
+    def _table_to_dataframe(self, table: pa.Table, downcast: bool = False, dtype_backend: str = None) -> pd.DataFrame:
+        """
+        Convert a query result table to pandas, see the `downcast` and `dtype_backend` options of query_athena.
+        The table's buffers are released while converting.
+        """
+        if downcast:
+            table = self._downcast_table(table)
+        dtype_backend = dtype_backend or self.dtype_backend
+        if dtype_backend not in ('numpy', 'pyarrow'):
+            raise ValueError("dtype_backend must be 'numpy' or 'pyarrow'.")
+        types_mapper = pd.ArrowDtype if dtype_backend == 'pyarrow' else None
+        return table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=types_mapper)
+
+    @staticmethod
+    def _can_unload(query_string: str) -> bool:
+        """
+        Whether a query can run through UNLOAD: plain SELECT queries whose row order does not matter, since the
+        order of an ORDER BY is not kept across the Parquet files UNLOAD writes.
+        """
+        query = query_string.lstrip().upper()
+        return query.startswith(('SELECT', 'WITH')) and not re.search(r'\bORDER\s+BY\b', query)
+
+    def _query_athena_unload(self, query_string, reduce_poll=False, downcast=False, dtype_backend=None, columns=None):
+        """
+        Run a SELECT query as UNLOAD to Parquet under `unload_location` and read the written files with pyarrow,
+        projecting `columns`. Columns keep their Athena types, e.g. a string partitioned year stays a string.
+        Each query unloads to a new prefix, so Athena result reuse does not apply. The prefix is deleted once
+        its files are read.
+        :return: Pandas DataFrame of the query results.
+        """
+        prefix = f"{self.unload_location.rstrip('/')}/{uuid.uuid4().hex}/"
+        self.query_athena(f"UNLOAD ({query_string}) TO '{prefix}' WITH (format = 'PARQUET', compression = 'SNAPPY')",
+                          return_result_location_only=True, reduce_poll=reduce_poll, result_reuse_minutes=0)
+
+        bucket, key_prefix = prefix.replace("s3://", "").split("/", 1)
+        objects = []
+        try:
+            paginator = self.s3.get_paginator('list_objects_v2')
+            objects = [obj for page in paginator.paginate(Bucket=bucket, Prefix=key_prefix)
+                       for obj in page.get('Contents', [])]
+            keys = [obj['Key'] for obj in objects if obj['Size'] > 0]
+
+            def read_object(key):
+                # The Parquet reader needs a seekable source, which the buffered object is
+                return pq.read_table(self._open_result_object(bucket, key), columns=columns)
+
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(keys)))) as executor:
+                tables = list(executor.map(read_object, keys))
+        except (BotoCoreError, ClientError) as e:
+            raise RuntimeError(f"AWS error occurred: {e}")
+        finally:
+            self._delete_objects(bucket, [obj['Key'] for obj in objects])
+        if not tables:
+            # UNLOAD writes no files for an empty result, so the columns come from the select list
+            return pd.DataFrame(columns=columns or _select_output_names(query_string))
+        return self._table_to_dataframe(pa.concat_tables(tables), downcast, dtype_backend)
+
+    def _delete_objects(self, bucket, keys):
+        """
+        Delete the given S3 objects, 1000 keys per request. Failures are logged rather than raised, so they do
+        not hide the result or error of the query that wrote the objects.
+        """
+        for start in range(0, len(keys), 1000):
+            batch = [{'Key': key} for key in keys[start:start + 1000]]
+            try:
+                response = self.s3.delete_objects(Bucket=bucket, Delete={'Objects': batch, 'Quiet': True})
+            except (BotoCoreError, ClientError) as e:
+                logger.warning("Failed to delete %d object(s) under s3://%s/: %s", len(batch), bucket, e)
+                continue
+            for error in response.get('Errors', []):
+                logger.warning("Failed to delete s3://%s/%s: %s", bucket, error.get('Key'), error.get('Message'))
+
+    @staticmethod
+    def _downcast_table(table: pa.Table) -> pa.Table:
+        """
+        Cast float64 columns to float32 and integer year/mohr columns to int16.
+        """
+        fields = []
+        for field in table.schema:
+            if pa.types.is_float64(field.type):
+                field = field.with_type(pa.float32())
+            elif field.name in ('year', 'mohr') and pa.types.is_integer(field.type):
+                field = field.with_type(pa.int16())
+            fields.append(field)
+        return table.cast(pa.schema(fields))
+
+    def _cache_path(self, index, columns=None):
+        """
+        Path of the on-disk cache file for a location index of the current table.
+        Files holding a column subset are keyed by the sorted column names.
+        """
+        key = f"{self.athena_table_name}/{index}"
+        if columns is not None:
+            key += "/" + ",".join(sorted(columns))
+        key = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, self.athena_table_name, f"{key}.parquet")
+
+    def _cache_get(self, index, columns=None):
+        """
+        Read a cached location timeseries from disk.
+        :param index: Location index.
+        :param columns: Columns to read. If None, all columns are read.
+        :return: A pandas DataFrame, or None on a cache miss or when caching is disabled.
+        """
+        if not self.cache_dir:
+            return None
+        # Prefer an entry for exactly these columns, else project them out of a full entry.
+        path = self._cache_path(index, columns)
+        if columns is not None and not os.path.exists(path):
+            path = self._cache_path(index)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_parquet(path, columns=columns)
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError, pa.ArrowException):
+            return None
+        return df
+
+    def _cache_put(self, index, df, columns=None):
+        """
+        Write a location timeseries to the on-disk cache and evict the least recently used
+        files once the cache exceeds cache_max_bytes. Failures never affect the caller.
+        """
+        if not self.cache_dir or df is None:
+            return
+        path = self._cache_path(index, columns)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            self._make_cache_dir(os.path.dirname(path))
+            df.to_parquet(tmp_path, compression='zstd', index=False)
+            os.replace(tmp_path, path)
+            self._evict_cache()
+        except (OSError, ValueError, pa.ArrowException):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict_cache(self):
+        """
+        Remove the least recently used cache files until the cache fits in cache_max_bytes.
+        """
+        entries = []
+        for root, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if file_name.endswith('.parquet'):
+                    stat = os.stat(os.path.join(root, file_name))
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, file_name)))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.cache_max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
+
     def get_column_names(self):
         if self.column_names is None:
             self.column_names=self._initialize_column_names()
+            self._refresh_column_views()
         
         return self.column_names
     
     def find_relevant_columns(self,heights):
+        '''
+        Columns at or bracketing each of the heights, sorted. The result only depends on the set of heights,
+        so it is memoized per client until the column mapping is rebuilt; callers get a fresh list to extend.
+        '''
         if self.column_mapping is None:
             self._initialize_column_mapping()
-        available_heights = sorted(self.column_mapping.keys())  # Get available heights
+        cache_key = tuple(sorted(set(heights)))
+        cached = self._relevant_columns_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        available_heights = self._sorted_heights  # Sorted available heights
         relevant_columns = []
 
         for height in heights:
@@ -267,9 +980,10 @@ class client_base:
                 # Exact match for height
                 relevant_columns.extend(self.column_mapping[height])
             else:
-                # Use upper and lower logic
-                lower = max((h for h in available_heights if h <= height), default=None)
-                upper = min((h for h in available_heights if h >= height), default=None)
+                # Use upper and lower logic, bracketing the height with a binary search
+                pos = int(np.searchsorted(available_heights, height))
+                lower = int(available_heights[pos - 1]) if pos > 0 else None
+                upper = int(available_heights[pos]) if pos < len(available_heights) else None
                 if lower:
                     relevant_columns.extend(self.column_mapping[lower])
                 if upper and upper != lower:
@@ -277,6 +991,9 @@ class client_base:
 
         # Deduplicate columns while preserving order
         columns = list(sorted(dict.fromkeys(relevant_columns)))
+        if len(self._relevant_columns_cache) >= _RELEVANT_COLUMNS_CACHE_SIZE:
+            self._relevant_columns_cache.pop(next(iter(self._relevant_columns_cache)))
+        self._relevant_columns_cache[cache_key] = tuple(columns)
         return columns
     
     def map_index_to_coordinates(self,df: pd.DataFrame = None) -> pd.DataFrame:
@@ -290,13 +1007,17 @@ class client_base:
         """
         if df is None:
             raise ValueError("Please provide a pandas dataframe with index column to map it to latitude and longitude.")
-        if self.location_gdf is None:
+        if self._index_array is None:
             self._load_preprocessed_data()
         
-        spatial_data = self.location_gdf.set_index('index').loc[df['index']]
+        # Resolve row positions through the prebuilt hash index instead of reindexing the whole location frame
+        positions = self._index_lookup.get_indexer(df['index'])
+        if (positions < 0).any():
+            missing = df['index'][positions < 0].unique().tolist()
+            raise KeyError(f"Unknown location index values: {missing}")
         # Add latitude and longitude to your DataFrame
-        df['latitude'] = spatial_data['latitude'].values
-        df['longitude'] = spatial_data['longitude'].values
+        df['latitude'] = self._latitudes[positions]
+        df['longitude'] = self._longitudes[positions]
 
         return df
     
@@ -304,27 +1025,58 @@ class client_base:
         '''
         Ensures column names are initialized based on query type(location based and non-location based.)
         '''
+        changed = False
+        previous_table_name = self.athena_table_name
         if self.column_names is None:
             try:
                 self.column_names = self._initialize_column_names()
             except Exception as e:
                 raise RuntimeError("Failed to initialize column names. Check your configuration.") from e
+            changed = True
 
         if lat is not None and long is not None:
             self.athena_table_name = self.default_athena_table_name
             if 'index' not in self.column_names:
                 self.column_names.append('index')
+                changed = True
         else:
             self.athena_table_name = self.alt_athena_table_name
             if 'index' in self.column_names:
                 self.column_names.remove('index')
+                changed = True
+        if self.athena_table_name != previous_table_name:
+            # IN list literals are formatted by the types of the table that is queried, see _sql_values
+            self._load_column_types()
+        # The derived views only need rebuilding when column_names changed
+        if changed or len(self.column_names_set) != len(self.column_names):
+            self._refresh_column_views()
+
+    def _load_column_types(self):
+        """
+        Set self.column_types to the catalog types of the current table. The column names are kept, the default
+        and alternative tables share their data columns. If the table cannot be described, the types of the
+        default table are used.
+        """
+        try:
+            columns = self._table_columns(self.athena_table_name or self.default_athena_table_name)
+        except (BotoCoreError, ClientError, RuntimeError):
+            columns = self._table_columns(self.default_athena_table_name)
+        self.column_types = dict(columns)
+
+    def _refresh_column_views(self):
+        '''
+        Rebuild the views derived from column_names after it changes: a set for constant time membership checks
+        and the default column selection, every column but 'index'.
+        '''
+        self.column_names_set = set(self.column_names)
+        self._default_columns_no_index = tuple(col for col in self.column_names if col != 'index')
     
     def get_location_gdf(self) -> pd.DataFrame:
         '''
         returns location_gdf of the respective class to investigate grid locations if needed.
 
         '''
-        if self.location_gdf is None:
+        if self._index_array is None:
             self._load_preprocessed_data()
         
         return self.location_gdf
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+Deferred Athena queries.
+
+The fetch methods of the clients return a LazyQuery instead of running the query when called with
+`defer=True`. Its plan is a Scan of one table, optionally wrapped in Filter and Project nodes, which are
+pushed down into the Scan when the query is built. collect_all runs several LazyQuery objects over the same
+table as a single Athena scan: the projections are unioned, the predicates are combined into a disjunction,
+and a boolean column per query marks which rows belong to whom, so the result is split back in pandas.
+
+A LazyAthenaResult refers to the result of a query that already ran and is left on S3 until it is read,
+with the column selection and row filter of the reader pushed into the scan of the result object.
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+
+def _output_name(expression: str) -> str:
+    """Name of the column produced by a SELECT list expression, e.g. 'index' for "... AS index"."""
+    return expression.split(" AS ")[-1].strip()
+
+
+class Scan:
+    """
+    Read the `columns` select expressions of `table` for the rows matching all `predicates`.
+
+    :param table: Athena table name.
+    :type table: str
+    :param columns: SELECT list expressions, either column names or "<expression> AS <name>".
+    :type columns: list[str]
+    :param predicates: SQL predicates combined with AND.
+    :type predicates: list[str]
+    """
+
+    def __init__(self, table: str, columns: list[str], predicates: list[str] = ()):
+        self.table = table
+        self.columns = tuple(columns)
+        self.predicates = tuple(predicates)
+
+    def sql(self) -> str:
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table}"
+        if self.predicates:
+            query += " WHERE " + " AND ".join(self.predicates)
+        return query
+
+    def __repr__(self):
+        return f"Scan({self.table!r}, columns={list(self.columns)!r}, predicates={list(self.predicates)!r})"
+
+
+class Filter:
+    """Keep the rows of `input` matching the SQL `predicate`."""
+
+    def __init__(self, input, predicate: str):
+        self.input = input
+        self.predicate = predicate
+
+
+class Project:
+    """Keep only the output `columns` (by name) of `input`."""
+
+    def __init__(self, input, columns: list[str]):
+        self.input = input
+        self.columns = tuple(columns)
+
+
+def push_down(plan) -> Scan:
+    """Fold the Filter and Project nodes of a plan into its Scan."""
+    if isinstance(plan, Scan):
+        return plan
+    scan = push_down(plan.input)
+    if isinstance(plan, Filter):
+        return Scan(scan.table, scan.columns, scan.predicates + (plan.predicate,))
+    if isinstance(plan, Project):
+        available = {_output_name(col) for col in scan.columns}
+        missing = [col for col in plan.columns if col not in available]
+        if missing:
+            raise ValueError(f"The following columns are not part of the query: {', '.join(missing)}")
+        keep = set(plan.columns)
+        return Scan(scan.table, [col for col in scan.columns if _output_name(col) in keep], scan.predicates)
+    raise TypeError(f"Unsupported plan node: {type(plan).__name__}")
+
+
+def merge_scans(scans: list[Scan]) -> tuple[str, list[str]]:
+    """
+    Build one query answering all `scans`, which must read the same table and agree on the expression of
+    every output name they share.
+
+    :return: A tuple of (query, match column per scan). The query selects the union of the projections plus a
+             boolean match column per scan, for the rows matching any of the scans.
+    """
+    columns = []
+    for scan in scans:
+        columns.extend(col for col in scan.columns if col not in columns)
+
+    conditions = [" AND ".join(f"({predicate})" for predicate in scan.predicates) or "TRUE" for scan in scans]
+    match_columns = [f"__match_{i}" for i in range(len(scans))]
+    # A predicate over a NULL value yields NULL, which must not mark the row as a match
+    select_list = columns + [f"COALESCE(({condition}), FALSE) AS {name}"
+                             for condition, name in zip(conditions, match_columns)]
+
+    query = f"SELECT {', '.join(select_list)} FROM {scans[0].table}"
+    if "TRUE" not in conditions:
+        query += " WHERE " + " OR ".join(f"({condition})" for condition in conditions)
+    return query, match_columns
+
+
+class LazyQuery:
+    """
+    An Athena query that runs on collect(), built by the fetch methods of a client when called with `defer=True`.
+
+    :param client: Client used to run the query.
+    :type client: windwatts_data.client_base
+    :param plan: Logical plan, a Scan optionally wrapped in Filter and Project nodes.
+    """
+
+    def __init__(self, client, plan):
+        self.client = client
+        self.plan = plan
+
+    def filter(self, predicate: str) -> "LazyQuery":
+        """Narrow the query down to the rows matching the SQL `predicate`, e.g. "windspeed_100m > 5"."""
+        return LazyQuery(self.client, Filter(self.plan, predicate))
+
+    def select(self, columns: list[str]) -> "LazyQuery":
+        """Narrow the query down to the given output columns."""
+        return LazyQuery(self.client, Project(self.plan, columns))
+
+    def sql(self) -> str:
+        """The SQL query run by collect()."""
+        return push_down(self.plan).sql()
+
+    def collect(self) -> pd.DataFrame:
+        """Run the query and return its result as a pandas DataFrame."""
+        return collect_all([self])[0]
+
+    def __repr__(self):
+        return f"LazyQuery({push_down(self.plan)!r})"
+
+
+def collect_all(queries: list[LazyQuery]) -> list[pd.DataFrame]:
+    """
+    Run several lazy queries with as few Athena scans as possible. Queries of the same client over the same
+    table are merged into one scan (see merge_scans) unless they give the same output name different
+    expressions, in which case they are scanned separately.
+
+    :param queries: The queries to run.
+    :type queries: list[LazyQuery]
+    :return: A list with the result DataFrame of each query, in order.
+    :rtype: list[pandas.DataFrame]
+    """
+    scans = [push_down(query.plan) for query in queries]
+
+    # Group query positions into scans of the same client and table with consistent output expressions
+    groups = []
+    for position, (query, scan) in enumerate(zip(queries, scans)):
+        expressions = {_output_name(col): col for col in scan.columns}
+        for group in groups:
+            if group['client'] is query.client and group['table'] == scan.table and all(
+                    group['expressions'].get(name, col) == col for name, col in expressions.items()):
+                group['expressions'].update(expressions)
+                group['positions'].append(position)
+                break
+        else:
+            groups.append({'client': query.client, 'table': scan.table,
+                           'expressions': expressions, 'positions': [position]})
+
+    results = [None] * len(queries)
+    for group in groups:
+        positions = group['positions']
+        if len(positions) == 1:
+            results[positions[0]] = group['client'].query_athena(scans[positions[0]].sql())
+            continue
+
+        query, match_columns = merge_scans([scans[position] for position in positions])
+        df = group['client'].query_athena(query)
+        for position, match_column in zip(positions, match_columns):
+            names = [_output_name(col) for col in scans[position].columns]
+            results[position] = df.loc[df[match_column].fillna(False).astype(bool), names].reset_index(drop=True)
+    return results
+
+
+class LazyAthenaResult:
+    """
+    Result of an Athena query kept on S3 until it is read, returned by fetch_windspeed_map(lazy=True).
+    Reading streams the CSV result object through a pyarrow dataset scan, so only the selected columns
+    and matching rows are converted and held in memory.
+
+    :param client: Client that ran the query, for its region and dtype_backend.
+    :type client: windwatts_data.client_base
+    :param result_uri: S3 URI of the result object.
+    :type result_uri: str
+    :param dtype_backend: 'numpy' or 'pyarrow', see query_athena. Defaults to the client's dtype_backend.
+    :type dtype_backend: str
+    """
+
+    def __init__(self, client, result_uri: str, dtype_backend: str = None):
+        self.client = client
+        self.result_uri = result_uri
+        self.dtype_backend = dtype_backend
+
+    def dataset(self) -> ds.Dataset:
+        """The result object as a pyarrow dataset, with 'index' read as strings."""
+        filesystem = pafs.S3FileSystem(region=self.client.config.get('region_name'))
+        file_format = ds.CsvFileFormat(convert_options=pacsv.ConvertOptions(
+            column_types={'index': pa.string()}, strings_can_be_null=True))
+        return ds.dataset(self.result_uri.replace("s3://", "", 1), format=file_format, filesystem=filesystem)
+
+    def to_pandas(self, columns: list[str] = None, filters: ds.Expression = None) -> pd.DataFrame:
+        """
+        Read the result into a pandas DataFrame.
+
+        :param columns: Columns to read. If None, all columns are read.
+        :type columns: list[str] or None
+        :param filters: Row filter as a pyarrow expression, e.g. pyarrow.dataset.field('windspeed_100m') > 5.
+                        If None, all rows are read.
+        :type filters: pyarrow.dataset.Expression or None
+        :return: The selected columns and rows of the result.
+        :rtype: pandas.DataFrame
+        """
+        table = self.dataset().to_table(columns=columns, filter=filters)
+        return self.client._table_to_dataframe(table, dtype_backend=self.dtype_backend)
+
+    def __repr__(self):
+        return f"LazyAthenaResult({self.result_uri!r})"
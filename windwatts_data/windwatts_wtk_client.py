@@ -1,6 +1,13 @@
+import numpy as np
 import pandas as pd
 from .client_base import client_base
 
+# Maximum number of location indexes per grouped Athena query, keeping the SQL text well below Athena's limit.
+_GRID_QUERY_BATCH_SIZE = 5000
+
+# Number of pushdown averages remembered per client.
+_AGGREGATE_CACHE_SIZE = 1024
+
 class WindwattsWTKClient(client_base):
     """
     This class is called "WindwattsWTKClient" because the source data is called "Wind ToolKit" and it is used by "Windwatts" application.
@@ -16,6 +23,10 @@ class WindwattsWTKClient(client_base):
         self.monthly_avg : float = None
         self.hourly_avg : float = None
         self.current_height : int = None
+        self.current_columns : list[str] = None
+        self._aggregate_cache : dict = {}
+        self._month : np.ndarray = None
+        self._hour : np.ndarray = None
 
     def pre_check(self, 
         lat: float = None,
@@ -43,9 +54,85 @@ class WindwattsWTKClient(client_base):
             self.hourly_avg = None
             self.current_height = height  # Update stored height
 
+    def _query_windspeed_average(self, lat: float, long: float, height: int, group_by: str = None) -> pd.DataFrame:
+        """
+        Compute the average windspeed at a height for the nearest location in Athena,
+        optionally grouped by 'year', 'month' or 'hour', so only the aggregated rows are transferred.
+        """
+        self._reset_index_(lat, long)
+
+        windspeed_column = f"windspeed_{height}m"
+        index = self.find_nearest_location(lat, long)
+        group_by_expressions = {
+            'year': "year",
+            'month': "CAST(mohr / 100 AS INT)",
+            'hour': "CAST(mohr % 100 AS INT)"
+        }
+
+        if group_by is None:
+            query = f"SELECT AVG({windspeed_column}) AS {windspeed_column} FROM {self.athena_table_name}"
+            query += f" WHERE {self._index_filter(index)}"
+        else:
+            expression = group_by_expressions[group_by]
+            query = f"SELECT {expression} AS {group_by}, AVG({windspeed_column}) AS {windspeed_column} FROM {self.athena_table_name}"
+            query += f" WHERE {self._index_filter(index)} GROUP BY {expression}"
+
+        return self.query_athena(query, reduce_poll=True)
+
+    def _get_pushdown_average(self, name: str, lat: float, long: float, height: int):
+        """
+        Return the average named `name` ('global_avg', 'yearly_avg', 'monthly_avg' or 'hourly_avg')
+        computed in Athena. Results are cached per (name, lat, long, height) so requesting a
+        different average for the same location does not re-issue the other queries. Callers get
+        a copy of the cached records, and the oldest entry is dropped once the cache holds
+        _AGGREGATE_CACHE_SIZE results.
+        """
+        cache_key = (name, lat, long, height)
+        if cache_key in self._aggregate_cache:
+            return self._copy_average(self._aggregate_cache[cache_key])
+
+        group_by = {'global_avg': None, 'yearly_avg': 'year', 'monthly_avg': 'month', 'hourly_avg': 'hour'}[name]
+        windspeed_column = f"windspeed_{height}m"
+
+        try:
+            result_df = self._query_windspeed_average(lat, long, height, group_by=group_by)
+        except Exception as e:
+            raise RuntimeError("Failed to fetch aggregated data.") from e
+
+        if result_df is None or result_df.empty or result_df[windspeed_column].isna().all():
+            raise RuntimeError("No data available after fetching.")
+
+        if group_by is None:
+            value = float(round(result_df[windspeed_column].iloc[0], 2))
+        else:
+            value = result_df[[group_by, windspeed_column]].round(2).sort_values(by=group_by, ascending=True).to_dict(orient='records')
+
+        if len(self._aggregate_cache) >= _AGGREGATE_CACHE_SIZE:
+            self._aggregate_cache.pop(next(iter(self._aggregate_cache)))
+        self._aggregate_cache[cache_key] = value
+        return self._copy_average(value)
+
+    @staticmethod
+    def _copy_average(value):
+        """Copy of a cached average, so callers can modify the returned records."""
+        if isinstance(value, list):
+            return [dict(record) for record in value]
+        return value
+
+    def _has_columns(self, columns: list[str] = None) -> bool:
+        """
+        Check whether the stored DataFrame holds the requested columns. None means all columns.
+        """
+        if self.current_columns is None:
+            return True
+        if columns is None:
+            return False
+        return set(columns).issubset(self.current_columns)
+
     def fetch_data(self,
         lat: float = None,
-        long: float = None) -> bool:
+        long: float = None,
+        columns: list[str] = None) -> bool:
         """
         Fetch windspeed column timeseries data for all years for a given location.
 
@@ -53,6 +140,8 @@ class WindwattsWTKClient(client_base):
         :type lat: float
         :param long: Longitude of the location. This parameter is required.
         :type long: float
+        :param columns: Columns to fetch. If None, all columns are fetched. Only the requested columns are scanned by Athena.
+        :type columns: list[str] or None
         :return: A pandas DataFrame containing all the columns(e.g. windspeed_30m, windspeed_100m, winddirection_30m, winddirection_100m, year, varset, index).
         :rtype: bool
         """
@@ -63,21 +152,48 @@ class WindwattsWTKClient(client_base):
         if long is None or not isinstance(long, (float, int)):
             raise ValueError("Longitude (long) is required and must be a float or int.")
         
-        # Prevent re-fetching if the coordinates are the same and data is already loaded when fetch_data is directly called.
-        if self.df is not None and self.current_lat == lat and self.current_long == long:
+        if columns is not None:
+            if not isinstance(columns, list) or not all(isinstance(col, str) for col in columns):
+                raise ValueError("Parameter 'columns' must be a list of strings representing column names.")
+            columns = list(dict.fromkeys(columns))
+
+        # Prevent re-fetching if the coordinates are the same and the loaded data already holds the requested columns.
+        if self.df is not None and self.current_lat == lat and self.current_long == long and self._has_columns(columns):
             print("Data is already up-to-date for these coordinates.")
             return False
         
         self._reset_index_(lat,long)
 
-        query = f"SELECT * FROM {self.athena_table_name} WHERE 1=1"
-        query += f" AND index in ('{self.find_nearest_location(lat, long)}')"
-        
-        df = self.query_athena(query, reduce_poll=True)
+        if columns is not None:
+            invalid_columns = [col for col in columns if col not in self.column_names_set]
+            if invalid_columns:
+                raise ValueError(f"The following columns are invalid: {', '.join(invalid_columns)}")
+
+        index = self.find_nearest_location(lat, long)
+
+        # Serve repeat locations from the on-disk cache and skip Athena entirely
+        df = self._cache_get(index, columns=columns)
+        if df is None:
+            columns_str = ', '.join(columns) if columns is not None else '*'
+            query = f"SELECT {columns_str} FROM {self.athena_table_name} WHERE 1=1"
+            query += f" AND {self._index_filter(index)}"
+
+            df = self.query_athena(query, reduce_poll=True, result_reuse_minutes=self.result_reuse_minutes, downcast=True)
+            self._cache_put(index, df, columns=columns)
 
         self.df = df
         self.current_lat = lat
         self.current_long = long
+        self.current_columns = columns
+
+        # Decode month and hour from mohr once per fetched DataFrame instead of adding columns to self.df
+        if 'mohr' in df:
+            month, hour = np.divmod(df['mohr'].to_numpy(), 100)
+            self._month = month.astype(np.int8)
+            self._hour = hour.astype(np.int8)
+        else:
+            self._month = None
+            self._hour = None
 
         return True
     
@@ -98,8 +214,8 @@ class WindwattsWTKClient(client_base):
         pd.DataFrame
             The DataFrame containing the timeseries wind data.
         """
-        # Check if self.df exists and the stored coordinates match the provided ones.
-        if self.df is not None and self.current_lat == lat and self.current_long == long:
+        # Check if self.df exists, holds all columns and the stored coordinates match the provided ones.
+        if self.df is not None and self.current_lat == lat and self.current_long == long and self._has_columns(None):
             return self.df
         # Otherwise, fetch data and return the updated DataFrame.
         self.fetch_data(lat, long)
@@ -108,7 +224,8 @@ class WindwattsWTKClient(client_base):
     def fetch_global_avg_at_height(self,
         lat: float = None,
         long: float = None,
-        height: int = None) -> dict:
+        height: int = None,
+        pushdown: bool = True) -> dict:
         """
         Calculate global windspeed average for specified height, filtered by a single location.
         Returns stored averages if fetch_data() does not fetch new data.
@@ -118,6 +235,8 @@ class WindwattsWTKClient(client_base):
         :param lat: Latitude (required).
         :param long: Longitude (required).
         :param int: Hub Height (required).
+        :param pushdown: If True (default), compute the average in Athena and fetch only the aggregated rows.
+            If False, fetch the full timeseries with fetch_data() and aggregate it with pandas.
 
         Returns
         -------
@@ -127,10 +246,14 @@ class WindwattsWTKClient(client_base):
         """
         
         self.pre_check(lat, long, height)
+
+        if pushdown:
+            return {"global_avg": self._get_pushdown_average('global_avg', lat, long, height)}
+
         self.reset_averages_if_height_changes(height)
 
         try:
-            is_data_fetched = self.fetch_data(lat, long)
+            is_data_fetched = self.fetch_data(lat, long, columns=[f'windspeed_{height}m', 'mohr', 'year', 'index'])
         except Exception as e:
             self.df = None  # Reset df to avoid using stale data
             raise RuntimeError("Failed to fetch timeseries data.") from e
@@ -143,7 +266,7 @@ class WindwattsWTKClient(client_base):
             return {"global_avg": self.global_avg}
         
         try:
-            self.global_avg = float(round(self.df[f'windspeed_{height}m'].mean(),2))
+            self.global_avg = round(float(self.df[f'windspeed_{height}m'].mean()),2)
         except Exception as e:
             raise RuntimeError(f"Failed to calculate global average for windspeed_{height}m.") from e
         
@@ -154,7 +277,8 @@ class WindwattsWTKClient(client_base):
     def fetch_yearly_avg_at_height(self,
         lat: float = None,
         long: float = None,
-        height: int = None) -> dict:
+        height: int = None,
+        pushdown: bool = True) -> dict:
         """
         Calculate yearly windspeed averages for specified height, filtered by a single location.
         Returns stored averages if fetch_data() does not fetch new data.
@@ -164,6 +288,8 @@ class WindwattsWTKClient(client_base):
         :param lat: Latitude (required).
         :param long: Longitude (required).
         :param height: Hub Height (required).
+        :param pushdown: If True (default), compute the average in Athena and fetch only the aggregated rows.
+            If False, fetch the full timeseries with fetch_data() and aggregate it with pandas.
 
         Returns
         -------
@@ -178,10 +304,14 @@ class WindwattsWTKClient(client_base):
         """
         
         self.pre_check(lat, long, height)
+
+        if pushdown:
+            return {"yearly_avg": self._get_pushdown_average('yearly_avg', lat, long, height)}
+
         self.reset_averages_if_height_changes(height)
 
         try:
-            is_data_fetched = self.fetch_data(lat, long)
+            is_data_fetched = self.fetch_data(lat, long, columns=[f'windspeed_{height}m', 'mohr', 'year', 'index'])
         except Exception as e:
             self.df = None  # Reset df to avoid using stale data
             raise RuntimeError("Failed to fetch timeseries data.") from e
@@ -194,8 +324,8 @@ class WindwattsWTKClient(client_base):
             return {"yearly_avg": self.yearly_avg}
         
         try:
-            yearly_avg_df = self.df.groupby('year')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='year', ascending=True)
-            self.yearly_avg = yearly_avg_df.to_dict(orient='records')
+            yearly_avg = self.df.groupby('year', sort=True, observed=True)[f'windspeed_{height}m'].mean().astype('float64').round(2)
+            self.yearly_avg = yearly_avg.reset_index().to_dict(orient='records')
         except Exception as e:
             raise RuntimeError(f"Failed to calculate yearly average for windspeed_{height}m.") from e
         
@@ -206,7 +336,8 @@ class WindwattsWTKClient(client_base):
     def fetch_monthly_avg_at_height(self,
         lat: float = None,
         long: float = None,
-        height: int = None) -> dict:
+        height: int = None,
+        pushdown: bool = True) -> dict:
         """
         Calculate monthly windspeed averages for specified height, filtered by a single location..
         Returns stored averages if fetch_data() does not fetch new data.
@@ -216,6 +347,8 @@ class WindwattsWTKClient(client_base):
         :param lat: Latitude (required).
         :param long: Longitude (required).
         :param height: Hub Height (required).
+        :param pushdown: If True (default), compute the average in Athena and fetch only the aggregated rows.
+            If False, fetch the full timeseries with fetch_data() and aggregate it with pandas.
 
         Returns
         -------
@@ -230,10 +363,14 @@ class WindwattsWTKClient(client_base):
         """
         
         self.pre_check(lat, long, height)
+
+        if pushdown:
+            return {"monthly_avg": self._get_pushdown_average('monthly_avg', lat, long, height)}
+
         self.reset_averages_if_height_changes(height)
 
         try:
-            is_data_fetched = self.fetch_data(lat, long)
+            is_data_fetched = self.fetch_data(lat, long, columns=[f'windspeed_{height}m', 'mohr', 'year', 'index'])
         except Exception as e:
             self.df = None  # Reset df to avoid using stale data
             raise RuntimeError("Failed to fetch timeseries data.") from e
@@ -245,11 +382,9 @@ class WindwattsWTKClient(client_base):
         if not is_data_fetched and self.monthly_avg is not None:
             return {"monthly_avg": self.monthly_avg}
     
-        self.df['month']=self.df['mohr']//100
-
         try:
-            monthly_avg_df = self.df.groupby('month')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='month', ascending=True)
-            self.monthly_avg = monthly_avg_df.to_dict(orient='records')
+            monthly_avg = self.df.groupby(self._month, sort=True, observed=True)[f'windspeed_{height}m'].mean().astype('float64').round(2)
+            self.monthly_avg = monthly_avg.rename_axis('month').reset_index().to_dict(orient='records')
         except Exception as e:
             raise RuntimeError(f"Failed to calculate monthly average for windspeed_{height}m.") from e
         
@@ -260,7 +395,8 @@ class WindwattsWTKClient(client_base):
     def fetch_hourly_avg_at_height(self,
         lat: float = None,
         long: float = None,
-        height: int = None) -> dict:
+        height: int = None,
+        pushdown: bool = True) -> dict:
         """
         Calculate hourly windspeed averages for specified height, filtered by a single location..
         Returns stored averages if fetch_data() does not fetch new data.
@@ -270,6 +406,8 @@ class WindwattsWTKClient(client_base):
         :param lat: Latitude (required).
         :param long: Longitude (required).
         :param height: Hub Height (required).
+        :param pushdown: If True (default), compute the average in Athena and fetch only the aggregated rows.
+            If False, fetch the full timeseries with fetch_data() and aggregate it with pandas.
 
         Returns
         -------
@@ -284,10 +422,14 @@ class WindwattsWTKClient(client_base):
         """
         
         self.pre_check(lat, long, height)
+
+        if pushdown:
+            return {"hourly_avg": self._get_pushdown_average('hourly_avg', lat, long, height)}
+
         self.reset_averages_if_height_changes(height)
 
         try:
-            is_data_fetched = self.fetch_data(lat, long)
+            is_data_fetched = self.fetch_data(lat, long, columns=[f'windspeed_{height}m', 'mohr', 'year', 'index'])
         except Exception as e:
             self.df = None  # Reset df to avoid using stale data
             raise RuntimeError("Failed to fetch timeseries data.") from e
@@ -299,14 +441,59 @@ class WindwattsWTKClient(client_base):
         if not is_data_fetched and self.hourly_avg is not None:
             return {"hourly_avg": self.hourly_avg}
         
-        self.df['hour'] = self.df['mohr']%100
-
         try:
-            hourly_avg_df = self.df.groupby('hour')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='hour', ascending=True)
-            self.hourly_avg = hourly_avg_df.to_dict(orient='records')  
+            hourly_avg = self.df.groupby(self._hour, sort=True, observed=True)[f'windspeed_{height}m'].mean().astype('float64').round(2)
+            self.hourly_avg = hourly_avg.rename_axis('hour').reset_index().to_dict(orient='records')
         except Exception as e:
             raise RuntimeError(f"Failed to calculate hourly average for windspeed_{height}m.") from e
         
         return {
                 "hourly_avg": self.hourly_avg   
-        }
\ No newline at end of file
+        }
+
+    def compute_global_avg_grid(self,
+        lats: list[float] = None,
+        longs: list[float] = None,
+        height: int = None) -> np.ndarray:
+        """
+        Calculate the global windspeed average at a height for many locations at once, e.g. to build a wind resource map.
+        All points are resolved with one batched KDTree query and the averages are computed by Athena with
+        a single grouped query (per batch of 5000 distinct locations) instead of one query per point.
+
+        Parameters
+        ----------
+        :param lats: Latitudes of the points (required).
+        :param longs: Longitudes of the points, same length as lats (required).
+        :param height: Hub Height (required).
+
+        Returns
+        -------
+        numpy.ndarray
+        A float32 array of average windspeeds aligned with the input points. Points without data are NaN.
+        """
+        if lats is None or longs is None or len(lats) == 0 or len(lats) != len(longs):
+            raise ValueError("Parameters 'lats' and 'longs' must be non-empty sequences of the same length.")
+
+        if not height or not isinstance(height, int):
+            raise TypeError("Parameter height of int type is required.")
+
+        if height not in self.column_mapping.keys():
+            raise ValueError("Invalid height. Use get_column_names() method to see valid heights in the data.")
+
+        windspeed_column = f"windspeed_{height}m"
+        indexes = self.find_nearest_locations_batch(lats, longs)
+        unique_indexes = sorted(set(indexes.tolist()))
+
+        averages = []
+        for start in range(0, len(unique_indexes), _GRID_QUERY_BATCH_SIZE):
+            batch = unique_indexes[start:start + _GRID_QUERY_BATCH_SIZE]
+            query = f"SELECT index, AVG({windspeed_column}) AS {windspeed_column} FROM {self.default_athena_table_name}"
+            query += f" WHERE {self._index_filter(batch)} GROUP BY index"
+            try:
+                averages.append(self.query_athena(query))
+            except Exception as e:
+                raise RuntimeError(f"Failed to calculate global averages for {windspeed_column}.") from e
+
+        result_df = pd.concat(averages, ignore_index=True)
+        averages_by_index = pd.Series(result_df[windspeed_column].to_numpy(), index=result_df['index'].astype(str))
+        return averages_by_index.reindex(indexes).to_numpy(dtype=np.float32)
@@ -47,7 +47,7 @@ class WTKLedClient1224(client_base):
         if years is None:
             raise TypeError("At least 1 value for the Parameter 'years' must be specified.")
         
-        if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        if not isinstance(years, list) or not self._all_int(years):
             raise ValueError("Parameter 'years' must be a list of integers.")
     
         if not isinstance(lat, (int, float)) or not isinstance(long, (int, float)):
@@ -147,17 +147,17 @@ class WTKLedClient1224(client_base):
 
         # 4. Validate `years`
         if years is not None:
-            if not isinstance(years, list) or not all(isinstance(year, int) for year in years):
+            if not isinstance(years, list) or not self._all_int(years):
                 raise ValueError("Parameter 'years' must be a list of integers representing years.")
 
         # 5. Validate `months`
         if months is not None:
-            if not isinstance(months, list) or not all(isinstance(month, int) and 1 <= month <= 12 for month in months):
+            if not isinstance(months, list) or not self._all_int(months, 1, 12):
                 raise ValueError("Parameter 'months' must be a list of integers (1-12).")
 
         # 6. Validate `hours`
         if hours is not None:
-            if not isinstance(hours, list) or not all(isinstance(hour, int) and 1 <= hour <= 24 for hour in hours):
+            if not isinstance(hours, list) or not self._all_int(hours, 1, 24):
                 raise ValueError("Parameter 'hours' must be a list of integers (1-24).")
 
         # 7. Validate `heights`
@@ -172,13 +172,11 @@ class WTKLedClient1224(client_base):
         
         # Ensure all requested columns exist
         if columns is not None:
-            invalid_columns = [col for col in columns if col not in self.column_names]
+            invalid_columns = [col for col in columns if col not in self.column_names_set]
             if invalid_columns:
                 raise ValueError(f"The following columns are invalid: {', '.join(invalid_columns)}")
         else:
-            columns = self.column_names.copy()
-            if 'index' in columns:
-                columns.remove('index')
+            columns = list(self._default_columns_no_index)
         
         
         # If heights are specified, find the nearest lower and higher columns for each height
@@ -195,7 +193,7 @@ class WTKLedClient1224(client_base):
         query = f"SELECT {columns_str}"
         
         if lat is None and long is None:
-            query += f", regexp_extract(\"$path\", '.*/index=([^/]+)/.*', 1) AS index"
+            query += f", {self._index_select_expression(self.athena_table_name)}"
         else:
             query += f", index"
         
@@ -204,21 +202,21 @@ class WTKLedClient1224(client_base):
         # Add filters dynamically
         if years:
             try:
-                year_list = ', '.join([f"'{year}'" for year in years])
+                year_list = self._sql_values('year', years)
                 query += f" AND year IN ({year_list})"
             except Exception:
                 raise ValueError("Invalid data in 'years' parameter.")
             
         if months:
             try:
-                month_list = ', '.join([str(month) for month in months])
+                month_list = ', '.join(map(str, months))
                 query += f" AND CAST(mohr / 100 AS INT) IN ({month_list})"
             except Exception:
                 raise ValueError("Invalid data in 'months' parameter.")
         
         if hours:
             try:
-                hour_list = ', '.join([str(hour) for hour in hours])
+                hour_list = ', '.join(map(str, hours))
                 query += f" AND CAST(mohr % 100 AS INT) IN ({hour_list})"
             except Exception:
                 raise ValueError("Invalid data in 'hours' parameter.")
@@ -237,8 +235,7 @@ class WTKLedClient1224(client_base):
                     indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                     if not indexes:
                         raise ValueError("No valid nearest locations found.")
-                    index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                    query += f" AND index IN ({index_list})"
+                    query += f" AND {self._index_filter(indexes)}"
             except Exception as e:
                 raise RuntimeError("Failed to process location-based filtering.") from e
                 
@@ -324,17 +321,17 @@ class WTKLedClient1224(client_base):
 
         ## 4. Validate `years`
         if years is not None:
-            if not isinstance(years, list) or not all(isinstance(year, int) for year in years):
+            if not isinstance(years, list) or not self._all_int(years):
                 raise ValueError("Parameter 'years' must be a list of integers representing years.")
         
         ## 5. Validate `months`
         if months is not None:
-            if not isinstance(months, list) or not all(isinstance(month, int) and 1 <= month <= 12 for month in months):
+            if not isinstance(months, list) or not self._all_int(months, 1, 12):
                 raise ValueError("Parameter 'months' must be a list of integers representing months.")
             
         ## 6. Validate `hours`
         if hours is not None:
-            if not isinstance(hours, list) or not all(isinstance(hour, int) and 1 <= hour <= 24 for hour in hours):
+            if not isinstance(hours, list) or not self._all_int(hours, 1, 24):
                 raise ValueError("Parameter 'hours' must be a list of integers representing hours.")
         
         ## 7. Validate `heights`
@@ -350,16 +347,11 @@ class WTKLedClient1224(client_base):
         # Ensure all requested columns exist
         if columns is not None:
             for column in columns:
-                if column not in self.column_names:
+                if column not in self.column_names_set:
                     raise ValueError(f"Column '{column}' does not exist in the table.")
         else:
-            columns = self.column_names.copy()
-            unwanted_cols_list=['mohr','varset','year','index']
-            for col in unwanted_cols_list:
-                try:
-                    columns.remove(col)
-                except ValueError:
-                    pass
+            unwanted_cols = {'mohr','varset','year','index'}
+            columns = [col for col in self.column_names if col not in unwanted_cols]
 
         # Filter columns by heights, if specified
         if heights:
@@ -402,24 +394,23 @@ class WTKLedClient1224(client_base):
                 else:
                     indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                     if indexes:
-                        index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                        query += f" AND index IN ({index_list})"
+                        query += f" AND {self._index_filter(indexes)}"
             except Exception as e:
                 raise RuntimeError("Failed to process location-based filtering for given lat and long.") from e
 
         # Add filters for years
         if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
+            years_list = self._sql_values('year', years)
             query += f" AND year IN ({years_list})"
 
         # Add filters for months
         if months:
-            month_list = ', '.join([str(month) for month in months])
+            month_list = ', '.join(map(str, months))
             query += f" AND CAST(mohr / 100 AS INT) IN ({month_list})"
         
         # Add filters for hours
         if hours:
-            hour_list = ', '.join([str(hour) for hour in hours])
+            hour_list = ', '.join(map(str, hours))
             query += f" AND CAST(mohr % 100 AS INT) IN ({hour_list})"   
         
         if group_by_columns:
@@ -481,12 +472,10 @@ class WTKLedClient1224(client_base):
     
         self._reset_index_(lat,long)
         
-        columns = self.column_names.copy()
-
         # Find the relevant windspeed column based on height
         if height is not None:
             windspeed_column = f"windspeed_{height}m"
-            if windspeed_column not in columns:
+            if windspeed_column not in self.column_names_set:
                 raise ValueError(f"Column '{windspeed_column}' does not exist in the table.")
         else:
             raise ValueError("Please specify height")
@@ -578,7 +567,7 @@ class WTKLedClient1224(client_base):
         if years is not None:
             if not isinstance(years, list):
                 raise TypeError("Parameter 'years' must be a list of integers.")
-            if not all(isinstance(year, int) for year in years):
+            if not self._all_int(years):
                 raise ValueError("All elements in 'years' must be integers.")
         
         self._reset_index_(lat,long)
@@ -600,7 +589,7 @@ class WTKLedClient1224(client_base):
 
         # Add years filter if provided
         if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
+            years_list = self._sql_values('year', years)
             query += f" AND year IN ({years_list})"
 
         # Add location filter
@@ -611,8 +600,7 @@ class WTKLedClient1224(client_base):
             else:
                 indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                 if indexes:
-                    index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                    query += f" AND index IN ({index_list})"
+                    query += f" AND {self._index_filter(indexes)}"
         except Exception as e:
             raise RuntimeError("Failed to process location-based filtering for given lat and long.") from e
 
@@ -1,15 +1,338 @@
+import hashlib
+import logging
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from io import BytesIO
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from .client_base import client_base
+from .lazy import LazyAthenaResult, LazyQuery, Scan
+
+logger = logging.getLogger(__name__)
+
+
+def _marginal_means(keys: list[np.ndarray], values: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Mean of `values` per distinct value of each integer key array, skipping NaN like pandas.
+    The rows are scanned once: sums and counts are accumulated per joint (key_1, ..., key_n) bucket with
+    bincount, and each marginal mean is derived from those sufficient statistics by summing the other axes.
+    Keys span small ranges (years, months, days, hours), so the joint buckets stay small.
+    :return: A list with a (sorted distinct keys, means) tuple per key array, empty arrays when there are no rows.
+    """
+    if values.size == 0:
+        return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)) for _ in keys]
+    offsets = [key.min() for key in keys]
+    shape = tuple(int(key.max() - offset) + 1 for key, offset in zip(keys, offsets))
+    codes = np.ravel_multi_index([key - offset for key, offset in zip(keys, offsets)], shape)
+    size = int(np.prod(shape))
+    valid = ~np.isnan(values)
+    present = np.bincount(codes, minlength=size).reshape(shape)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=size).reshape(shape)
+    counts = np.bincount(codes[valid], minlength=size).reshape(shape)
+
+    marginals = []
+    for axis, offset in enumerate(offsets):
+        other_axes = tuple(a for a in range(len(shape)) if a != axis)
+        key_present = present.sum(axis=other_axes) > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums.sum(axis=other_axes) / counts.sum(axis=other_axes)
+        marginals.append((np.flatnonzero(key_present) + offset, means[key_present]))
+    return marginals
+
+
+def _average_records(key: str, keys: np.ndarray, column: str, means: np.ndarray) -> list[dict]:
+    """
+    Emit [{key: k, column: mean}, ...] records with means rounded to 2 decimals, straight from the arrays
+    instead of building, rounding and sorting an intermediate DataFrame.
+    """
+    return [{key: k, column: mean} for k, mean in zip(keys.tolist(), np.round(means, 2).tolist())]
+
+
+def _validate_int_range(name: str, values: list[int], low: int = None, high: int = None):
+    """
+    Raise a ValueError unless `values` is None or a list of integers within [low, high].
+    The type and range checks run once over the whole list, see client_base._all_int.
+    """
+    if values is None:
+        return
+    if not isinstance(values, list) or not client_base._all_int(values, low, high):
+        expected = f"({low}-{high})" if low is not None else f"representing {name}"
+        raise ValueError(f"Parameter '{name}' must be a list of integers {expected}.")
+
+
+def _to_half_precision(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast windspeed columns to float16 (about 3 significant digits, ample below 80 m/s) and winddirection columns
+    to nullable UInt16 hundredths of a degree (0-36000), in place. Both take a quarter of the float64 memory.
+    """
+    for col in df.columns:
+        if col.startswith('windspeed'):
+            df[col] = df[col].to_numpy(dtype=np.float32, na_value=np.nan).astype(np.float16)
+        elif col.startswith('winddirection'):
+            degrees = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+            df[col] = pd.array(np.round(degrees * 100), dtype='Float32').astype('UInt16')
+    return df
+
+
+# Rows per Parquet batch read and per CSV chunk formatted when converting downloads.
+_CSV_BATCH_ROWS = 65536
+
+# Maximum number of time_index BETWEEN ranges emitted by _build_time_predicate before falling back to arithmetic filters.
+_MAX_TIME_RANGES = 500
+
+# Bounds of the calendar fields encoded in the YYYYMMDDHH time_index, in order of significance.
+_TIME_FIELDS = (('year', 1000000, None, None), ('month', 10000, 1, 12), ('day', 100, 1, 31), ('hour', 1, 0, 23))
+
+# Integer arithmetic extracting parts of the YYYYMMDDHH time_index in Athena.
+_TIME_PART_EXPRESSIONS = {
+    'year': "time_index / 1000000",
+    'month': "(time_index / 10000) % 100",
+    'day': "(time_index / 100) % 100",
+    'hour': "time_index % 100"
+}
+
+
+@lru_cache(maxsize=4096)
+def _int_list(values: tuple) -> str:
+    """
+    Comma separated IN list of the distinct integers in `values`, sorted. Month, day and hour filters come
+    from small domains and repeat across calls, so the fragments are memoized. Pass a tuple.
+    """
+    return ', '.join(map(str, sorted(set(values))))
+
+
+@lru_cache(maxsize=256)
+def _aggregate_clauses(statistic: str, columns: tuple, group_by_index: bool, group_by_year: bool,
+                       group_by_month: bool, group_by_day: bool, group_by_hour: bool) -> tuple:
+    """
+    Build the SELECT and GROUP BY clauses of an aggregate query. They only depend on the shape of the
+    request, so they are memoized and repeated calls only append the filters.
+    :return: A tuple of (SELECT list, output column names, GROUP BY list or '').
+    """
+    select_clause = [f"{statistic}({col}) AS {col}_{statistic.lower()}" for col in columns]
+    group_by_columns = []
+
+    if group_by_index:
+        select_clause.append("index")
+        group_by_columns.append("index")
+
+    if group_by_year:
+        select_clause.append("year")
+        group_by_columns.append("year")
+
+    for part, enabled in (('month', group_by_month), ('day', group_by_day), ('hour', group_by_hour)):
+        if enabled:
+            select_clause.append(f"{_TIME_PART_EXPRESSIONS[part]} AS {part}")
+            group_by_columns.append(_TIME_PART_EXPRESSIONS[part])
+
+    output_names = tuple(col.split(" AS ")[-1] for col in select_clause)
+    return ', '.join(select_clause), output_names, ', '.join(group_by_columns)
+
+
+@dataclass(frozen=True)
+class _SqlBuilder:
+    """
+    Template of the row queries of fetch_windspeed_map and get_filtered_data_full_hourly: the `columns` of
+    `table` for the rows matching the calendar, varset and location filters. Filters left as None are not
+    applied. build() emits the predicates in a fixed order, the year, varset and location partition filters
+    first and the time_index filters last, so the literals collected into `params` line up with their
+    placeholders.
+
+    :param index_from_path: Select the location index parsed from "$path" instead of the 'index' column,
+                            see client_base._index_select_expression.
+    """
+    client: client_base
+    table: str
+    columns: list
+    index_from_path: bool = False
+    years: list = None
+    months: list = None
+    days: list = None
+    hours: list = None
+    varset: str = None
+    indexes: list = None
+
+    def select_list(self) -> list[str]:
+        if self.index_from_path:
+            return self.columns + [self.client._index_select_expression(self.table)]
+        return self.columns + ["index"]
+
+    def build(self, params: list[str] = None) -> Scan:
+        """
+        :param params: If given, the literals are appended to it and replaced by ? placeholders, see _bind.
+        :return: The query as a Scan.
+        """
+        predicates = self.client._year_filter(self.years, params)
+        predicates.extend(self.client._varset_filter(self.table, self.varset, params))
+        if self.indexes is not None:
+            predicates.append(self.client._location_filter(self.indexes, params))
+        predicates.extend(self.client._build_time_predicate(self.years, self.months, self.days, self.hours,
+                                                            params=params, include_year=False))
+        return Scan(self.table, self.select_list(), predicates)
+
+    def build_union_by_year(self, params: list[str] = None) -> str:
+        """
+        Build one SELECT per year, combined with UNION ALL. Each branch prunes to a single year partition with
+        its own small time predicate, and Athena scans the branches in parallel.
+
+        :param params: If given, collects the literals of all branches in order, see build.
+        :return: The SQL query.
+        """
+        return " UNION ALL ".join(replace(self, years=[year]).build(params).sql()
+                                  for year in sorted(set(self.years)))
 
 
 class WTKLedClientFullHourly(client_base):
+
+    # Default varset, which also stands for every varset when the table has no 'all' partition.
+    _VARSET_SENTINEL = 'all'
     
     def __init__(self, config_path : str = None):
         # Load configuration from a file if provided
         super().__init__(config_path, data='wtk')
+        # Location subsets materialized with CTAS by get_filtered_data_full_hourly(cache_result=True), keyed by
+        # a hash of (indexes, columns, varset). They are kept until drop_result_cache or close is called.
+        self._result_cache = {}
+        self._result_cache_token = uuid.uuid4().hex[:8]
+        self.result_cache_location = self.config.get(
+            'result_cache_location', f"{(self.output_location or '').rstrip('/')}/windwatts_result_cache")
+
+    def close(self):
+        """
+        Release the resources of the client held in Athena, i.e. drop the tables of the result cache, see
+        drop_result_cache. The client can also be used as a context manager, which calls close on exit.
+        """
+        self.drop_result_cache()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
+    @staticmethod
+    def _time_part(part: str) -> str:
+        """
+        SQL expression extracting 'year', 'month', 'day' or 'hour' from the YYYYMMDDHH integer time_index
+        with integer arithmetic, avoiding a per-row cast to VARCHAR and string comparisons in Athena.
+        """
+        return _TIME_PART_EXPRESSIONS[part]
+
+    def _build_time_predicate(self,
+        years: list[int] = None,
+        months: list[int] = None,
+        days: list[int] = None,
+        hours: list[int] = None,
+        params: list[str] = None,
+        include_year: bool = True) -> list[str]:
+        """
+        Build WHERE predicates for calendar filters that compare time_index natively, so Athena can prune
+        Parquet row groups by their time_index min/max statistics.
+
+        The year partition filter comes first, unless `include_year` is False and the caller adds it with
+        _year_filter. The leading run of given fields (year, then month, day
+        and hour) is expanded into the Cartesian product of time_index BETWEEN ranges, with adjacent ranges
+        merged, as long as it yields at most 500 ranges. Fields listing every possible value are dropped. Fields
+        after the expanded run, or after a gap in it, are filtered with integer arithmetic on time_index.
+        Without years there are no ranges.
+
+        :param params: If given, the literals are appended to it and replaced by ? placeholders, see _bind.
+        :return: A list of SQL predicates to combine with AND.
+        """
+        given = {'year': years, 'month': months, 'day': days, 'hour': hours}
+        # A field listing every possible value does not restrict the data
+        for name, _, low, high in _TIME_FIELDS[1:]:
+            if given[name] and set(given[name]) >= set(range(low, high + 1)):
+                given[name] = None
+        predicates = self._year_filter(years, params) if include_year else []
+
+        # Longest leading run of given fields whose product of values stays within the range limit
+        prefix_length = 0
+        range_count = 1
+        for name, _, _, _ in _TIME_FIELDS:
+            values = given[name]
+            if not values or range_count * len(set(values)) > _MAX_TIME_RANGES:
+                break
+            range_count *= len(set(values))
+            prefix_length += 1
+
+        if prefix_length > 0:
+            # Each range spans the full extent of the fields that are not part of the prefix
+            low_offset = sum(scale * low for _, scale, low, _ in _TIME_FIELDS[prefix_length:])
+            high_offset = sum(scale * high for _, scale, _, high in _TIME_FIELDS[prefix_length:])
+            starts = [0]
+            for name, scale, _, _ in _TIME_FIELDS[:prefix_length]:
+                starts = [start + value * scale for start in starts for value in sorted(set(given[name]))]
+
+            ranges = []
+            for start in starts:
+                low, high = start + low_offset, start + high_offset
+                if ranges and low == ranges[-1][1] + 1:
+                    ranges[-1][1] = high
+                else:
+                    ranges.append([low, high])
+            predicates.append("(" + " OR ".join(
+                f"time_index BETWEEN {self._bind(str(low), params)} AND {self._bind(str(high), params)}"
+                for low, high in ranges) + ")")
+
+        for name, _, _, _ in _TIME_FIELDS[max(prefix_length, 1):]:
+            if given[name]:
+                if params is None:
+                    value_list = _int_list(tuple(given[name]))
+                else:
+                    value_list = ', '.join(self._bind(str(value), params) for value in sorted(set(given[name])))
+                predicates.append(f"{self._time_part(name)} IN ({value_list})")
+        return predicates
+
+    def _year_filter(self, years: list[int], params: list[str] = None) -> list[str]:
+        """Predicates selecting the year partitions of `years`, as a list with zero or one element."""
+        if not years:
+            return []
+        year_list = ', '.join(self._bind(self._sql_values('year', [year]), params) for year in years)
+        return [f"year IN ({year_list})"]
+
+    def _varset_filter(self, table: str, varset: str, params: list[str] = None) -> list[str]:
+        """
+        Predicates selecting `varset` in `table`, as a list with zero or one element. The filter is left out when
+        it cannot exclude anything: the table's only varset is `varset`, or `varset` is the 'all' sentinel and
+        the table has no such partition. An unknown varset raises instead of silently returning no rows.
+        The varsets are known when the table declares them with partition projection, see _partition_values.
+        """
+        if not varset:
+            return []
+        known_varsets = self._partition_values(table, 'varset')
+        if known_varsets is not None:
+            if varset not in known_varsets:
+                if varset == self._VARSET_SENTINEL:
+                    return []
+                raise ValueError(f"Unknown varset '{varset}'. Available varsets: {', '.join(sorted(known_varsets))}")
+            if known_varsets == {varset}:
+                return []
+        return ["varset = " + self._bind(f"'{varset}'", params)]
+
+    def _location_filter(self, indexes: list[str], params: list[str] = None) -> str:
+        """
+        Predicate on one or more location indexes. A single index is compared with =, several are matched with
+        the canonical IN list of _index_filter, or one placeholder per index when collecting `params`.
+        """
+        if len(indexes) == 1:
+            return "index = " + self._bind(f"'{indexes[0]}'", params)
+        if params is None:
+            return self._index_filter(indexes)
+        index_list = ', '.join(self._bind(f"'{index}'", params) for index in sorted(set(indexes)))
+        return f"index IN ({index_list})"
+
+    def _run_query(self, query: str, params: list[str] = None, **kwargs):
+        """Run `query` with query_athena, or as a prepared statement when `params` were collected."""
+        if params is not None:
+            return self.query_athena_prepared(query, params, **kwargs)
+        return self.query_athena(query, **kwargs)
+
     def fetch_windspeed_column_at_height(self,
         lat: float = None,
         long: float = None,
@@ -40,7 +363,7 @@ class WTKLedClientFullHourly(client_base):
 
         windspeed_column = f"windspeed_{height}m"
 
-        if windspeed_column not in self.column_names:
+        if windspeed_column not in self.column_schema:
             raise ValueError(f"Column '{windspeed_column}' does not exist in the table.")
         
         query = f"SELECT * FROM {self.athena_table_name} WHERE 1=1"
@@ -51,16 +374,19 @@ class WTKLedClientFullHourly(client_base):
     def fetch_windwatts_data(self,
         lat: float = None,
         long: float = None,
-        height: float = None) -> dict:
+        height: float = None,
+        pushdown: bool = True) -> dict:
         """
         Calculate windspeed statistics (yearly, monthly, hourly and daily average) for specified height, 
-        filtered by a single location using pandas.
+        filtered by a single location.
 
         Parameters
         ----------
         :param lat: Latitude (required).
         :param lon: Longitude (required).
         :param height: Height (required).
+        :param pushdown: If True (default), compute all averages in Athena with a single GROUPING SETS query
+                         and fetch only the aggregated rows. If False, fetch the full timeseries and aggregate it with pandas.
 
         Returns
         -------
@@ -86,45 +412,93 @@ class WTKLedClientFullHourly(client_base):
                 {"hour": 1, "windspeed_{height}m": 5.10}
             ]
         """
+        if pushdown:
+            return self._fetch_windwatts_data_pushdown(lat, long, height)
+
         try:
             df = self.fetch_windspeed_column_at_height(lat=lat,long=long,height=height)
         except Exception as e:
             raise RuntimeError("Failed to fetch timeseries data.") from e
 
-        df['time_index'] = pd.to_datetime(df['time_index'].astype(str), format='%Y%m%d%H')
-        # Extract month, day, and hour into new columns
-        df['month'] = df['time_index'].dt.month
-        df['day'] = df['time_index'].dt.day
-        df['hour'] = df['time_index'].dt.hour
+        # Decode month, day, and hour from the YYYYMMDDHH time_index with integer arithmetic
+        time_index = df['time_index'].to_numpy(dtype=np.int64)
+        df['month'] = (time_index // 10000) % 100
+        df['day'] = (time_index // 100) % 100
+        df['hour'] = time_index % 100
         try:
             global_avg = float(round(df[f'windspeed_{height}m'].mean(),2))
         except Exception as e:
             raise RuntimeError(f"Failed to calculate global average for windspeed_{height}m.") from e
         
+        # Accumulate all four groupings in one pass over flat arrays instead of four DataFrame groupbys
+        windspeed_column = f'windspeed_{height}m'
+        groupings = (('year', 'yearly_avg'), ('month', 'monthly_avg'), ('day', 'daily_avg'), ('hour', 'hourly_avg'))
         try:
-            yearly_avg = df.groupby('year')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='year', ascending=True)
-        except Exception as e:
-            raise RuntimeError(f"Failed to calculate yearly average for windspeed_{height}m.") from e
-        try:
-            monthly_avg = df.groupby('month')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='month', ascending=True)
-        except Exception as e:
-            raise RuntimeError(f"Failed to calculate monthly average for windspeed_{height}m.") from e
-        try:
-            daily_avg = df.groupby('day')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='day', ascending=True)
+            marginals = _marginal_means([df[key].to_numpy(dtype=np.int64) for key, _ in groupings],
+                                        df[windspeed_column].to_numpy(dtype=np.float64))
         except Exception as e:
-            raise RuntimeError(f"Failed to calculate daily average for windspeed_{height}m.") from e
+            raise RuntimeError(f"Failed to calculate yearly, monthly, daily and hourly averages for {windspeed_column}.") from e
+
+        result = {"global_avg": global_avg}
+        for (key, name), (group_keys, means) in zip(groupings, marginals):
+            result[name] = _average_records(key, group_keys, windspeed_column, means)
+
+        return result
+
+    def _fetch_windwatts_data_pushdown(self, lat: float, long: float, height: int) -> dict:
+        """
+        Compute the global, yearly, monthly, daily and hourly windspeed averages for the nearest location
+        in one Athena query using GROUPING SETS, so only the aggregated rows are transferred.
+        """
+        if lat is None or long is None:
+            raise TypeError("Lat and Long parameters are required.")
+
+        if not height or not isinstance(height,int):
+            raise TypeError("Parameter height of int type is required.")
+
+        if height not in self.column_mapping.keys():
+            raise TypeError("Invalid height. Use get_column_names() method to see valid heights in the data.")
+
+        self._reset_index_(lat,long)
+
+        windspeed_column = f"windspeed_{height}m"
+        if windspeed_column not in self.column_schema:
+            raise ValueError(f"Column '{windspeed_column}' does not exist in the table.")
+
+        group_by_expressions = {
+            'year': "year",
+            'month': self._time_part('month'),
+            'day': self._time_part('day'),
+            'hour': self._time_part('hour')
+        }
+        select_clause = [f"{expression} AS {key}" for key, expression in group_by_expressions.items()]
+        select_clause.append(f"AVG({windspeed_column}) AS {windspeed_column}")
+        grouping_sets = ', '.join(f"({expression})" for expression in group_by_expressions.values())
+
+        query = f"SELECT {', '.join(select_clause)} FROM {self.athena_table_name}"
+        query += f" WHERE {self._index_filter(self.find_nearest_location(lat, long))}"
+        query += f" GROUP BY GROUPING SETS ({grouping_sets}, ())"
+
         try:
-            hourly_avg = df.groupby('hour')[f'windspeed_{height}m'].mean().reset_index().round(2).sort_values(by='hour', ascending=True)
+            result_df = self.query_athena(query, reduce_poll=True)
         except Exception as e:
-            raise RuntimeError(f"Failed to calculate hourly average for windspeed_{height}m.") from e
-        
-        return {
-            "global_avg": global_avg,
-            "yearly_avg": yearly_avg.to_dict(orient='records'),
-            "monthly_avg": monthly_avg.to_dict(orient='records'),
-            "daily_avg": daily_avg.to_dict(orient='records'),
-            "hourly_avg": hourly_avg.to_dict(orient='records')
-        }
+            raise RuntimeError("Failed to fetch aggregated data.") from e
+
+        if result_df is None or result_df.empty or result_df[windspeed_column].isna().all():
+            raise RuntimeError("No data available after fetching.")
+
+        # Each row belongs to the grouping set whose key is the only non-null key; the global row has none.
+        present = result_df[list(group_by_expressions)].notna()
+        key_count = present.sum(axis=1)
+        result = {"global_avg": float(round(result_df.loc[key_count == 0, windspeed_column].iloc[0], 2))}
+        aggregate_names = {'year': 'yearly_avg', 'month': 'monthly_avg', 'day': 'daily_avg', 'hour': 'hourly_avg'}
+        for key, name in aggregate_names.items():
+            rows = present[key] & (key_count == 1)
+            keys = result_df.loc[rows, key].to_numpy(dtype=np.int64)
+            order = np.argsort(keys, kind='stable')
+            means = result_df.loc[rows, windspeed_column].to_numpy(dtype=np.float64)
+            result[name] = _average_records(key, keys[order], windspeed_column, means[order])
+        return result
 
     def download_full_hourly_data(self,
             years: list[int]= None,
@@ -132,7 +506,9 @@ class WTKLedClientFullHourly(client_base):
             long: float= None,
             n_nearest: int = 1,
             varset: str = 'all',
-            local_dir: str = 'downloads'
+            local_dir: str = 'downloads',
+            columns: list[str] = None,
+            s3_select: bool = False
         ) -> list[str]:
         """
         Download CSV.GZ files containing timeseries data at specific location(s) for specific year(s).
@@ -149,6 +525,12 @@ class WTKLedClientFullHourly(client_base):
         :type varset: str
         :param local_dir: Local directory to save the downloaded files. Default is 'downloads'.(Optional)
         :type local_dir: str
+        :param columns: Columns to read from the Parquet files and write to the CSV files (e.g. ['windspeed_100m', 'time_index']).
+                        Only these columns are decoded. If None, all columns are written.(Optional)
+        :type columns: list[str] or None
+        :param s3_select: If True, project `columns` server side with S3 Select so only those columns are transferred.
+                          Requires `columns` and S3 Select access on the bucket. Default is False.(Optional)
+        :type s3_select: bool
         :raises TypeError: If `lat` or `long` or `years` is None.
         :raises ValueError: If `years` is not a list of integers, if `lat` or `long` are not valid numbers, 
                             or if `n_nearest` is not between 1 and 16.
@@ -162,7 +544,7 @@ class WTKLedClientFullHourly(client_base):
         if years is None:
             raise ValueError("At least 1 value for the Parameter 'years' must be specified.")
         
-        if not isinstance(years, list) or not all(isinstance(y, int) for y in years):
+        if not isinstance(years, list) or not self._all_int(years):
             raise ValueError("Parameter 'years' must be a list of integers.")
     
         if not isinstance(lat, (int, float)) or not isinstance(long, (int, float)):
@@ -174,6 +556,13 @@ class WTKLedClientFullHourly(client_base):
         if not (1 <= n_nearest <= 16):
             raise ValueError("Parameter 'n_nearest' must be between 1 and 16.")
         
+        if columns is not None:
+            if not isinstance(columns, list) or not columns or not all(isinstance(col, str) for col in columns):
+                raise ValueError("Parameter 'columns' must be a non-empty list of strings representing column names.")
+        
+        if s3_select and columns is None:
+            raise ValueError("Parameter 'columns' must be provided when 's3_select' is True.")
+        
         try:
             if not os.path.exists(local_dir):
                 os.makedirs(local_dir)
@@ -189,35 +578,88 @@ class WTKLedClientFullHourly(client_base):
         except Exception as e:
             raise RuntimeError(f"Failed to determine nearest locations: {e}")
 
-        # Step 2: Construct and download files
-        downloaded_files = []
-        for index in indexes:
-            for year in years:
-                s3_key = f"ts-parquet/year={year}/varset={varset}/index={index}/{index}_{year}_{varset}.parquet"
-                local_csv_path = os.path.join(local_dir, f"{index}_{year}_{varset}.csv")
-            try:
-                print(f"Downloading {s3_key} from S3...")
-                
-                # Stream Parquet file from S3
-                response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-                parquet_data = response['Body'].read()
-                
-                # Convert Parquet to DataFrame
-                parquet_buffer = BytesIO(parquet_data)
-                try:
-                    df = pd.read_parquet(parquet_buffer)
-                    
-                    # Save as CSV
-                    df.to_csv(local_csv_path, index=False)
-                    downloaded_files.append(local_csv_path)
-                    print(f"Converted and saved CSV file: {local_csv_path}")
-                finally:
-                    # Clear the buffer
-                    parquet_buffer.close()
-            except Exception as e:
-                print(f"Failed to process {s3_key}: {str(e)}")
+        # Step 2: Construct and download files concurrently, the work is bound by S3 round-trips
+        tasks = [(index, year) for index in indexes for year in years]
+        with ThreadPoolExecutor(max_workers=max(1, min(16, len(tasks)))) as executor:
+            futures = [executor.submit(self._download_one, index, year, varset, local_dir, columns, s3_select) for index, year in tasks]
+            downloaded_files = [future.result() for future in futures]
+        downloaded_files = [path for path in downloaded_files if path is not None]
+        if len(downloaded_files) != len(tasks):
+            logger.warning("Downloaded %d of %d files for %d location(s) and %d year(s).",
+                           len(downloaded_files), len(tasks), len(indexes), len(years))
 
         return downloaded_files
+
+    def _download_one(self, index: str, year: int, varset: str, local_dir: str, columns: list[str] = None, s3_select: bool = False) -> str:
+        """
+        Download the Parquet file for one location index and year and convert it to CSV.
+        The shared S3 client is thread-safe, so this is called from several worker threads.
+        :return: The local CSV path, or None if the file could not be processed.
+        """
+        s3_key = f"ts-parquet/year={year}/varset={varset}/index={index}/{index}_{year}_{varset}.parquet"
+        local_csv_path = os.path.join(local_dir, f"{index}_{year}_{varset}.csv")
+        try:
+            print(f"Downloading {s3_key} from S3...")
+            
+            if s3_select:
+                self._select_to_csv(s3_key, local_csv_path, columns)
+                print(f"Selected and saved CSV file: {local_csv_path}")
+                return local_csv_path
+            
+            # Parquet needs random access to its footer, so keep the compressed object in an Arrow buffer
+            source = self._open_result_object(self.bucket_name, s3_key)
+            
+            # Stream row groups into Arrow's CSV writer instead of materializing a DataFrame
+            parquet_file = pq.ParquetFile(source)
+            if columns is None:
+                file_columns = [name for name in parquet_file.schema_arrow.names if not name.startswith('__index_level_')]
+            else:
+                missing_columns = [col for col in columns if col not in parquet_file.schema_arrow.names]
+                if missing_columns:
+                    raise ValueError(f"The following columns are not in the file: {', '.join(missing_columns)}")
+                file_columns = columns
+            schema = pa.schema([parquet_file.schema_arrow.field(name) for name in file_columns])
+            try:
+                write_options = pacsv.WriteOptions(quoting_style='needed', batch_size=_CSV_BATCH_ROWS)
+                with pacsv.CSVWriter(local_csv_path, schema, write_options=write_options) as writer:
+                    for batch in parquet_file.iter_batches(batch_size=_CSV_BATCH_ROWS, columns=file_columns):
+                        writer.write_batch(batch)
+            except Exception:
+                # Do not leave a truncated CSV behind
+                if os.path.exists(local_csv_path):
+                    os.remove(local_csv_path)
+                raise
+            print(f"Converted and saved CSV file: {local_csv_path}")
+            return local_csv_path
+        except Exception as e:
+            print(f"Failed to process {s3_key}: {str(e)}")
+            return None
+
+    def _select_to_csv(self, s3_key: str, local_csv_path: str, columns: list[str]):
+        """
+        Project `columns` of a Parquet object server side with S3 Select and stream the returned CSV records to disk.
+        S3 Select does not emit a header row, so the column names are written first.
+        """
+        column_list = ', '.join(f's."{col}"' for col in columns)
+        response = self.s3.select_object_content(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ExpressionType='SQL',
+            Expression=f"SELECT {column_list} FROM S3Object s",
+            InputSerialization={'Parquet': {}},
+            OutputSerialization={'CSV': {}}
+        )
+        try:
+            with open(local_csv_path, 'wb') as f:
+                f.write((','.join(columns) + '\n').encode())
+                for event in response['Payload']:
+                    if 'Records' in event:
+                        f.write(event['Records']['Payload'])
+        except Exception:
+            # Do not leave a truncated CSV behind
+            if os.path.exists(local_csv_path):
+                os.remove(local_csv_path)
+            raise
     
     def get_statistic_full_hourly(self,
             columns: list[str] = None,
@@ -298,21 +740,21 @@ class WTKLedClientFullHourly(client_base):
 
         ## Validate `years`
         if years is not None:
-            if not isinstance(years, list) or not all(isinstance(year, int) for year in years):
+            if not isinstance(years, list) or not self._all_int(years):
                 raise ValueError("Parameter 'years' must be a list of integers representing years.")
         
         ## Validate `months`
         if months is not None:
-            if not isinstance(months, list) or not all(isinstance(month, int) and 1 <= month <= 12 for month in months):
+            if not isinstance(months, list) or not self._all_int(months, 1, 12):
                 raise ValueError("Parameter 'months' must be a list of integers representing months.")
          # Validate `days`
         if days is not None:
-            if not isinstance(days, list) or not all(isinstance(day, int) and 1 <= day <= 31 for day in days):
+            if not isinstance(days, list) or not self._all_int(days, 1, 31):
                 raise ValueError("Parameter 'days' must be a list of integers (1-31).")
             
         ## Validate `hours`
         if hours is not None:
-            if not isinstance(hours, list) or not all(isinstance(hour, int) and 0 <= hour <= 23 for hour in hours):
+            if not isinstance(hours, list) or not self._all_int(hours, 0, 23):
                 raise ValueError("Parameter 'hours' must be a list of integers representing hours[0-23].")
         
         ## Validate `heights`
@@ -328,94 +770,69 @@ class WTKLedClientFullHourly(client_base):
         # Ensure all requested columns exist
         if columns is not None:
             for column in columns:
-                if column not in self.column_names:
+                if column not in self.column_names_set:
                     raise ValueError(f"Column '{column}' does not exist in the table.")
         else:
-            columns = self.column_names.copy()
-            unwanted_cols_list=['time_index','varset','year','index']
-            for col in unwanted_cols_list:
-                try:
-                    columns.remove(col)
-                except ValueError:
-                    pass
+            unwanted_cols = {'time_index','varset','year','index'}
+            columns = [col for col in self.column_names if col not in unwanted_cols]
 
         # Filter columns by heights, if specified
         if heights:
             columns = self.find_relevant_columns(heights)
 
-        # Construct the SELECT clause for statistical computation
-        select_clause = [f"{statistic}({col}) AS {col}_{statistic.lower()}" for col in columns]
-        
-        # Add grouping columns conditionally
-        group_by_columns = []
-        
-        if n_nearest > 1 and group_by_index:
-            select_clause.append("index")
-            group_by_columns.append("index")
-        
-        if group_by_year:
-            select_clause.append("year")
-            group_by_columns.append("year")
-        
-        if group_by_month:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 5, 2) AS month")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 5, 2)")
-        
-        if group_by_day:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 7, 2) AS day")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 7, 2)")
-        
-        if group_by_hour:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 9, 2) AS hour")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 9, 2)")
+        # Construct the SELECT and GROUP BY clauses for statistical computation
+        select_sql, output_names, group_by_sql = _aggregate_clauses(
+            statistic, tuple(columns), n_nearest > 1 and group_by_index,
+            group_by_year, group_by_month, group_by_day, group_by_hour
+        )
         
         # Ensure the order_by column is in the SELECT clause
-        if order_by and order_by.lower() not in [col.split(" AS ")[-1] for col in select_clause]:
-            raise ValueError(f"The order_by column '{order_by}' must be included in the SELECT statement. Here are the selected columns for this query: {', '.join(select_clause)}")
+        if order_by and order_by.lower() not in output_names:
+            raise ValueError(f"The order_by column '{order_by}' must be included in the SELECT statement. Here are the selected columns for this query: {select_sql}")
+        if order_by and order_direction.upper() not in ['ASC', 'DESC']:
+            raise ValueError("Invalid order_direction. Use 'ASC' or 'DESC'.")
         
-        query = f"SELECT {', '.join(select_clause)} FROM {self.athena_table_name} WHERE 1=1"
+        query_parts = [f"SELECT {select_sql}", "FROM", self.athena_table_name, "WHERE 1=1"]
         
         # Add filters for location
         if lat is not None and long is not None:
             try:
                 if n_nearest == 1:
                     index = self.find_nearest_location(lat, long)
-                    query += f" AND index IN ('{index}')"
+                    query_parts.append(f"AND {self._index_filter(index)}")
                 else:
                     indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                     if indexes:
-                        index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                        query += f" AND index IN ({index_list})"
+                        query_parts.append(f"AND {self._index_filter(indexes)}")
             except Exception as e:
                 raise RuntimeError("Failed to process location-based filtering for given lat and long.") from e
 
         # Add filters for years
         if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
-            query += f" AND year IN ({years_list})"
+            years_list = self._sql_values('year', years)
+            query_parts.append(f"AND year IN ({years_list})")
 
         if months:
-            month_list = ', '.join([f"'{month:02}'" for month in months])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 5, 2) IN ({month_list})"
+            month_list = _int_list(tuple(months))
+            query_parts.append(f"AND {self._time_part('month')} IN ({month_list})")
 
         if days:
-            day_list = ', '.join([f"'{day:02}'" for day in days])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 7, 2) IN ({day_list})"
+            day_list = _int_list(tuple(days))
+            query_parts.append(f"AND {self._time_part('day')} IN ({day_list})")
 
         if hours:
-            hour_list = ', '.join([f"'{hour:02}'" for hour in hours])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 9, 2) IN ({hour_list})"
-        
-        if group_by_columns:
-            query += f" GROUP BY {', '.join(group_by_columns)}"
+            hour_list = _int_list(tuple(hours))
+            query_parts.append(f"AND {self._time_part('hour')} IN ({hour_list})")
         
-        result_df = self.query_athena(query)
+        if group_by_sql:
+            query_parts.append(f"GROUP BY {group_by_sql}")
         
         # Add ORDER BY clause if specified
         if order_by:
-            if order_direction.upper() not in ['ASC', 'DESC']:
-                raise ValueError("Invalid order_direction. Use 'ASC' or 'DESC'.")
-            query += f" ORDER BY {order_by} {order_direction.upper()}"
+            query_parts.append(f"ORDER BY {order_by} {order_direction.upper()}")
+        
+        query = " ".join(query_parts)
+        result_df = self.query_athena(query)
         
         return result_df
     
@@ -468,60 +885,40 @@ class WTKLedClientFullHourly(client_base):
     
         self._reset_index_(lat,long)
         
-        columns = self.column_names.copy()
-
         # Find the relevant windspeed column based on height
         if height is not None:
             windspeed_column = f"windspeed_{height}m"
-            if windspeed_column not in columns:
+            if windspeed_column not in self.column_schema:
                 raise ValueError(f"Column '{windspeed_column}' does not exist in the table.")
         else:
             raise ValueError("Please specify height")
         
-        # Construct the SELECT clause
-        avg_column_name = f"{windspeed_column}_avg"  # Reflect height in the column name
-        select_clause = [f"AVG({windspeed_column}) AS {avg_column_name}"]
-        
-        # Add grouping columns conditionally
-        group_by_columns = []
-        
-        if group_by_year:
-            select_clause.append("year")
-            group_by_columns.append("year")
-        
-        if group_by_month:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 5, 2) AS month")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 5, 2)")
-        
-        if group_by_day:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 7, 2) AS day")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 7, 2)")
-        
-        if group_by_hour:
-            select_clause.append("SUBSTRING(CAST(time_index AS VARCHAR), 9, 2) AS hour")
-            group_by_columns.append("SUBSTRING(CAST(time_index AS VARCHAR), 9, 2)")
-        
+        # Construct the SELECT and GROUP BY clauses, the average column is named {windspeed_column}_avg
+        select_sql, output_names, group_by_sql = _aggregate_clauses(
+            'AVG', (windspeed_column,), False, group_by_year, group_by_month, group_by_day, group_by_hour
+        )
         
         # Ensure the order_by column is in the SELECT clause
-        if order_by and order_by.lower() not in [col.split(" AS ")[-1] for col in select_clause]:
-            raise ValueError(f"The order_by column '{order_by}' must be included in the SELECT statement. Here are the selected columns for this query: {', '.join(select_clause)}")
+        if order_by and order_by.lower() not in output_names:
+            raise ValueError(f"The order_by column '{order_by}' must be included in the SELECT statement. Here are the selected columns for this query: {select_sql}")
+        if order_by and order_direction.upper() not in ['ASC', 'DESC']:
+            raise ValueError("Invalid order_direction. Use 'ASC' or 'DESC'.")
         
-        query = f"SELECT {', '.join(select_clause)} FROM {self.athena_table_name} WHERE 1=1"
+        query_parts = [f"SELECT {select_sql}", "FROM", self.athena_table_name, "WHERE 1=1"]
         
         # Add filters for location
         if lat is not None and long is not None:
             index = self.find_nearest_location(lat, long)
-            query += f" AND index IN ('{index}')"
+            query_parts.append(f"AND {self._index_filter(index)}")
         
-        if group_by_columns:
-            query += f" GROUP BY {', '.join(group_by_columns)}"
+        if group_by_sql:
+            query_parts.append(f"GROUP BY {group_by_sql}")
         
         # Add ORDER BY clause if specified
         if order_by:
-            if order_direction.upper() not in ['ASC', 'DESC']:
-                raise ValueError("Invalid order_direction. Use 'ASC' or 'DESC'.")
-            query += f" ORDER BY {order_by} {order_direction.upper()}"
+            query_parts.append(f"ORDER BY {order_by} {order_direction.upper()}")
         
+        query = " ".join(query_parts)
         # Execute the query and return the result as a DataFrame
         result_df = self.query_athena(query)
         return result_df
@@ -549,6 +946,9 @@ class WTKLedClientFullHourly(client_base):
         :type n_nearest: int
         :return: A pandas DataFrame containing windspeed and wind direction time series data.
         :rtype: pandas.DataFrame
+
+        The query is logged at DEBUG level, enable it with
+        ``logging.getLogger('windwatts_data').setLevel(logging.DEBUG)``.
         """
         # Validate inputs
         if lat is None or long is None:
@@ -571,7 +971,7 @@ class WTKLedClientFullHourly(client_base):
         if years is not None:
             if not isinstance(years, list):
                 raise TypeError("Parameter 'years' must be a list of integers.")
-            if not all(isinstance(year, int) for year in years):
+            if not self._all_int(years):
                 raise ValueError("All elements in 'years' must be integers.")
         
         self._reset_index_(lat,long)
@@ -593,7 +993,7 @@ class WTKLedClientFullHourly(client_base):
 
         # Add years filter if provided
         if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
+            years_list = self._sql_values('year', years)
             query += f" AND year IN ({years_list})"
 
         # Add location filter
@@ -604,15 +1004,14 @@ class WTKLedClientFullHourly(client_base):
             else:
                 indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                 if indexes:
-                    index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                    query += f" AND index IN ({index_list})"
+                    query += f" AND {self._index_filter(indexes)}"
         except Exception as e:
             raise RuntimeError("Failed to process location-based filtering for given lat and long.") from e
         if varset:
                 query += f" AND varset = '{varset}'"
         # Execute the query
         try:
-            print(query)
+            logger.debug("Athena query: %s", query)
             result_df = self.query_athena(query)
         except Exception as e:
             raise RuntimeError("Failed to execute query and fetch results.") from e
@@ -625,7 +1024,12 @@ class WTKLedClientFullHourly(client_base):
                             months: list[int] = None,
                             days: list[int] = None,
                             hours: list[int] = None,
-                            varset: str = "all"):
+                            varset: str = "all",
+                            defer: bool = False,
+                            lazy: bool = False,
+                            include_time: bool = True,
+                            dtype_backend: str = None,
+                            precision: str = 'full'):
         """
         Fetch windspeed and winddirection map for a given heights.
         Filter by years, months, days and hours.
@@ -640,6 +1044,23 @@ class WTKLedClientFullHourly(client_base):
         :type months: list[int]
         :param hours: List of hours (e.g., [0, 6, 12, 23]) to filter the data. This parameter is required. Range(0-23).
         :type hours: list[int]
+        :param defer: If True, return a windwatts_data.LazyQuery instead of running the query. Several deferred
+                      queries can then be run as a single Athena scan with windwatts_data.collect_all.
+        :type defer: bool
+        :param lazy: If True, run the query but leave its result on S3 and return a windwatts_data.LazyAthenaResult,
+                     whose to_pandas(columns, filters) only reads the requested columns and rows.
+        :type lazy: bool
+        :param include_time: If False, the 'time_index' and 'year' columns are not returned, so Athena reads fewer
+                             columns when only the map values are needed. Filters still apply. Default is True.
+        :type include_time: bool
+        :param dtype_backend: 'pyarrow' returns Arrow-backed columns (double[pyarrow] values, int64[pyarrow]
+                              time_index and year, string[pyarrow] index), which take less memory than the
+                              NumPy/object columns of 'numpy'. Defaults to the `dtype_backend` config value, else 'numpy'.
+        :type dtype_backend: str
+        :param precision: 'full' (default) keeps the values as read. 'half' returns windspeed columns as float16
+                          and winddirection columns as UInt16 hundredths of a degree, a quarter of the memory.
+                          Only applies to the returned DataFrame, so it cannot be combined with `defer` or `lazy`.
+        :type precision: str
         :return: A pandas DataFrame containing windspeed and wind direction map data.
         :rtype: pandas.DataFrame
         
@@ -653,26 +1074,17 @@ class WTKLedClientFullHourly(client_base):
         
         if years is None or months is None or hours is None or days is None:
             raise ValueError("Atleast one value for 'years', 'months' 'days' and 'hours' list must be specified.")
-        
-        # Validate `years`
-        if years is not None:
-            if not isinstance(years, list) or not all(isinstance(year, int) for year in years):
-                raise ValueError("Parameter 'years' must be a list of integers representing years.")
 
-        # Validate `months`
-        if months is not None:
-            if not isinstance(months, list) or not all(isinstance(month, int) and 1 <= month <= 12 for month in months):
-                raise ValueError("Parameter 'months' must be a list of integers (1-12).")
+        if precision not in ('full', 'half'):
+            raise ValueError("Parameter 'precision' must be 'full' or 'half'.")
+        if precision == 'half' and (defer or lazy):
+            raise ValueError("precision='half' cannot be combined with 'defer' or 'lazy'.")
         
-        # Validate `days`
-        if days is not None:
-            if not isinstance(days, list) or not all(isinstance(day, int) and 1 <= day <= 31 for day in days):
-                raise ValueError("Parameter 'days' must be a list of integers (1-31).")
-
-        # Validate `hours`
-        if hours is not None:
-            if not isinstance(hours, list) or not all(isinstance(hour, int) and 0 <= hour <= 23 for hour in hours):
-                raise ValueError("Parameter 'hours' must be a list of integers (0-23).")
+        # Validate `years`, `months`, `days` and `hours`
+        _validate_int_range('years', years)
+        _validate_int_range('months', months, 1, 12)
+        _validate_int_range('days', days, 1, 31)
+        _validate_int_range('hours', hours, 0, 23)
         
         self._reset_index_(None,None)
         
@@ -682,45 +1094,72 @@ class WTKLedClientFullHourly(client_base):
             columns = [col for col in columns if col.startswith('windspeed') or col.startswith('winddirection')]
             if not columns:
                 raise ValueError("Could not find relevant columns for 'windspeed' or 'winddirection' at the specified height.")
-            columns.extend(['time_index', 'year'])
+            if include_time:
+                columns.extend(['time_index', 'year'])
         except Exception as e:
             raise RuntimeError("Failed to find relevant columns for the specified height.") from e
         
 
         # Construct the query
-        columns_str = ', '.join(columns)
-        
-        query = f"SELECT {columns_str}"
-        query += f", regexp_extract(\"$path\", '.*/index=([^/]+)/.*', 1) AS index"
-        query += f" FROM {self.athena_table_name} WHERE 1=1"
-
-        if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
-            query += f" AND year IN ({years_list})"
-
-        if months:
-            month_list = ', '.join([f"'{month:02}'" for month in months])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 5, 2) IN ({month_list})"
-
-        if days:
-            day_list = ', '.join([f"'{day:02}'" for day in days])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 7, 2) IN ({day_list})"
-
-        if hours:
-            hour_list = ', '.join([f"'{hour:02}'" for hour in hours])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 9, 2) IN ({hour_list})"
-        
-        if varset:
-            query += f" AND varset = '{varset}'"
+        scan = _SqlBuilder(self, self.athena_table_name, columns, index_from_path=True, years=years,
+                           months=months, days=days, hours=hours, varset=varset).build()
+        if defer:
+            return LazyQuery(self, scan)
 
         # Execute the query
         try:
-            result_df = self.query_athena(query)
+            if lazy:
+                return LazyAthenaResult(self, self.query_athena(scan.sql(), return_result_uri=True), dtype_backend)
+            result_df = self.query_athena(scan.sql(), dtype_backend=dtype_backend)
         except Exception as e:
             raise RuntimeError("Failed to execute query and fetch results.") from e
 
+        if precision == 'half':
+            result_df = _to_half_precision(result_df)
+
         return result_df
     
+    def _cached_subset_table(self, indexes: list[str], columns: list[str], varset: str) -> str:
+        """
+        Name of a session scoped Athena table holding the given columns of the given locations and varset,
+        created with CTAS on first use. It is partitioned by year and stored as Parquet, so later time window
+        queries over the same locations scan only this subset instead of the full table.
+        """
+        key = hashlib.blake2b(repr((sorted(indexes), sorted(columns), varset)).encode()).hexdigest()[:16]
+        table_name = self._result_cache.get(key)
+        if table_name is not None:
+            return table_name
+
+        table_name = f"wtk_cache_{key}_{self._result_cache_token}"
+        # Partition columns go last in a CTAS select list, time_index is kept for the time filters
+        data_columns = [col for col in columns if col not in ('index', 'year', 'time_index')]
+        select_list = ', '.join(data_columns + ['time_index', 'index', 'year'])
+        query = (
+            f"CREATE TABLE {table_name} "
+            f"WITH (format = 'PARQUET', external_location = '{self.result_cache_location}/{table_name}/', "
+            f"partitioned_by = ARRAY['year']) "
+            f"AS SELECT {select_list} FROM {self.default_athena_table_name} "
+            f"WHERE {self._index_filter(indexes)}"
+        )
+        for predicate in self._varset_filter(self.default_athena_table_name, varset):
+            query += f" AND {predicate}"
+        try:
+            self.query_athena(query, return_result_location_only=True, result_reuse_minutes=0)
+        except Exception as e:
+            raise RuntimeError("Failed to materialize the location subset for caching.") from e
+        self._result_cache[key] = table_name
+        return table_name
+
+    def drop_result_cache(self):
+        """
+        Drop the Athena tables created by get_filtered_data_full_hourly(cache_result=True). Their Parquet files
+        under `result_cache_location` are left in S3 for a lifecycle rule to expire. This must be called, directly
+        or through close(), once the cached tables are no longer needed, otherwise they remain in the Glue catalog.
+        """
+        while self._result_cache:
+            _, table_name = self._result_cache.popitem()
+            self.query_athena(f"DROP TABLE IF EXISTS {table_name}", return_result_location_only=True, result_reuse_minutes=0)
+
     def get_filtered_data_full_hourly(self,
         columns: list[str] = None,
         years: list[int] = None,
@@ -731,7 +1170,11 @@ class WTKLedClientFullHourly(client_base):
         long: float = None,
         heights: list[float] = None,
         n_nearest: int = 1,
-        varset: str = "all"
+        varset: str = "all",
+        cache_result: bool = False,
+        defer: bool = False,
+        include_time: bool = True,
+        dtype_backend: str = None
         ) -> pd.DataFrame:
         """
         Generalized function to fetch filtered data(timeseries and map), given filters based on location(s), time and height(s).
@@ -756,6 +1199,23 @@ class WTKLedClientFullHourly(client_base):
         :type n_nearest: int
         :param varset: Variable set to filter data. Default is "all".
         :type varset: str
+        :param cache_result: If True and `lat`/`long` are given, the selected columns of the nearest location(s) are
+                             materialized once into a Parquet table (Athena CTAS) and this and later calls with the
+                             same locations, columns and varset only scan that table. The tables are not dropped
+                             automatically: call drop_result_cache() or close(), or use the client in a `with`
+                             block, when done. Default is False.
+        :type cache_result: bool
+        :param defer: If True, return a windwatts_data.LazyQuery instead of running the query. Its collect() returns
+                      the data as a DataFrame even without `lat`/`long`, and windwatts_data.collect_all runs several
+                      deferred queries as a single Athena scan. Default is False.
+        :type defer: bool
+        :param include_time: If False, the 'time_index' and 'year' columns are not added to the columns selected for
+                             `heights`, so Athena reads fewer columns. Filters still apply. Default is True.
+        :type include_time: bool
+        :param dtype_backend: 'pyarrow' returns Arrow-backed columns (double[pyarrow] values, int64[pyarrow]
+                              time_index and year, string[pyarrow] index), which take less memory than the
+                              NumPy/object columns of 'numpy'. Defaults to the `dtype_backend` config value, else 'numpy'.
+        :type dtype_backend: str
         :return: A pandas DataFrame containing the filtered data(map or timeseries) based on the specified parameters.
         :rtype: pandas.DataFrame
         """
@@ -776,27 +1236,13 @@ class WTKLedClientFullHourly(client_base):
             if not isinstance(columns, list) or not all(isinstance(col, str) for col in columns):
                 raise ValueError("Parameter 'columns' must be a list of strings representing column names.")
 
-        # 4. Validate `years`
-        if years is not None:
-            if not isinstance(years, list) or not all(isinstance(year, int) for year in years):
-                raise ValueError("Parameter 'years' must be a list of integers representing years.")
+        # 4. Validate `years`, `months`, `hours` and `days`
+        _validate_int_range('years', years)
+        _validate_int_range('months', months, 1, 12)
+        _validate_int_range('hours', hours, 0, 23)
+        _validate_int_range('days', days, 1, 31)
 
-        # 5. Validate `months`
-        if months is not None:
-            if not isinstance(months, list) or not all(isinstance(month, int) and 1 <= month <= 12 for month in months):
-                raise ValueError("Parameter 'months' must be a list of integers (1-12).")
-
-        # 6. Validate `hours`
-        if hours is not None:
-            if not isinstance(hours, list) or not all(isinstance(hour, int) and 0 <= hour <= 23 for hour in hours):
-                raise ValueError("Parameter 'hours' must be a list of integers (0-23).")
-        
-        # 7. Validate `days`
-        if days is not None:
-            if not isinstance(days, list) or not all(isinstance(day, int) and 1 <= day <= 31 for day in days):
-                raise ValueError("Parameter 'days' must be a list of integers (1-31).")
-
-        # 8. Validate `heights`
+        # 5. Validate `heights`
         if heights is not None:
             if not isinstance(heights, list) or not all(isinstance(height, (int, float)) for height in heights):
                 raise ValueError("Parameter 'heights' must be a list of numeric values (int or float).")
@@ -808,68 +1254,75 @@ class WTKLedClientFullHourly(client_base):
         
         # Ensure all requested columns exist
         if columns is not None:
-            invalid_columns = [col for col in columns if col not in self.column_names]
+            invalid_columns = [col for col in columns if col not in self.column_names_set]
             if invalid_columns:
                 raise ValueError(f"The following columns are invalid: {', '.join(invalid_columns)}")
         else:
-            columns = self.column_names.copy()
-            if 'index' in columns:
-                columns.remove('index')
+            columns = list(self._default_columns_no_index)
         
         
         # If heights are specified, find the nearest lower and higher columns for each height
         if heights:
             try:
                 columns = self.find_relevant_columns(heights)
-                columns.extend(['time_index', 'year'])
+                if include_time:
+                    columns.extend(['time_index', 'year'])
             except Exception as e:
                 raise RuntimeError("Failed to find relevant columns for specified heights.") from e
 
-        # Construct the SELECT clause
-        columns_str = ', '.join(columns)
-        
-        query = f"SELECT {columns_str}"
-        if lat is None and long is None:
-            query += f", regexp_extract(\"$path\", '.*/index=([^/]+)/.*', 1) AS index"
-        else:
-            query += f", index"
-        query += f" FROM {self.athena_table_name} WHERE 1=1"
-
-        if years:
-            years_list = ', '.join([f"'{year}'" for year in years])
-            query += f" AND year IN ({years_list})"
-
-        if months:
-            month_list = ', '.join([f"'{month:02}'" for month in months])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 5, 2) IN ({month_list})"
-
-        if days:
-            day_list = ', '.join([f"'{day:02}'" for day in days])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 7, 2) IN ({day_list})"
-
-        if hours:
-            hour_list = ', '.join([f"'{hour:02}'" for hour in hours])
-            query += f" AND SUBSTRING(CAST(time_index AS VARCHAR), 9, 2) IN ({hour_list})"
-        
-        if varset:
-            query += f" AND varset = '{varset}'"
-        
         if lat is not None and long is not None:
             if n_nearest == 1:
                 #index = '000003'
                 index = self.find_nearest_location(lat, long)
                 if not index:
                     raise ValueError("No valid nearest location found.")
-                query += f" AND index = '{index}'"
+                indexes = [index]
             else:
                 indexes = self.find_n_nearest_locations(lat, long, n_nearest)
                 if not indexes:
                     raise ValueError("No valid nearest locations found.")
-                index_list = ', '.join([f"'{idx}'" for idx in indexes])
-                query += f" AND index IN ({index_list})"
-            
-            result_df = self.query_athena(query)
+
+        # Construct the query
+        builder = _SqlBuilder(self, self.athena_table_name, columns, index_from_path=lat is None and long is None,
+                              years=years, months=months, days=days, hours=hours)
+        # Bind the filter values of plain queries as parameters of a prepared statement if enabled
+        prepared = self.prepared_statements and not defer and not cache_result
+
+        if cache_result and lat is not None and long is not None:
+            # The cached table only holds these locations and varset
+            scan = replace(builder, table=self._cached_subset_table(indexes, columns, varset)).build()
+            queries = [(scan.sql(), None)]
         else:
-            result_df = self.query_athena(query,return_result_location_only=True)
-        
+            builder = replace(builder, varset=varset)
+            # Several nearest locations are fetched with one query each, run concurrently
+            if lat is None and long is None:
+                location_groups = [None]
+            elif n_nearest > 1 and not defer and self.max_concurrency > 1:
+                location_groups = [[index] for index in sorted(set(indexes))]
+            else:
+                location_groups = [indexes]
+
+            queries = []
+            for location_indexes in location_groups:
+                params = [] if prepared else None
+                group_builder = replace(builder, indexes=location_indexes)
+                if not defer and years and len(set(years)) > 1 and (months or days or hours):
+                    query = group_builder.build_union_by_year(params)
+                else:
+                    scan = group_builder.build(params)
+                    query = scan.sql()
+                queries.append((query, params))
+
+        if defer:
+            return LazyQuery(self, scan)
+        if lat is not None and long is not None:
+            query_options = {'dtype_backend': dtype_backend}
+        else:
+            query_options = {'return_result_location_only': True}
+        if len(queries) == 1:
+            return self._run_query(*queries[0], **query_options)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries))) as executor:
+            frames = list(executor.map(lambda query: self._run_query(*query, **query_options), queries))
+        result_df = pd.concat(frames, ignore_index=True)
         return result_df
\ No newline at end of file